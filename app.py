@@ -21,6 +21,8 @@ APP_VERSION = "2.4.0"
 
 import os
 import sys
+import csv
+import io
 import json
 import hashlib
 import logging
@@ -28,17 +30,24 @@ import re
 import time
 import sqlite3
 import threading
+import uuid
+import signal
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from io import BytesIO, StringIO
-from functools import wraps
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 
 import requests
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
+import lxml.html
 from flask import Flask, render_template, jsonify, request, redirect, url_for, Response
+from flask.json.provider import DefaultJSONProvider
+from requests.adapters import HTTPAdapter
 import urllib3
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from urllib3.util.retry import Retry
 
 try:
     import gridstatus
@@ -46,6 +55,29 @@ try:
 except ImportError:
     GRIDSTATUS_AVAILABLE = False
 
+# calamine (Rust) parses xlsx several times faster than openpyxl; pandas
+# (pinned >= 2.2) accepts it as an engine
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+EXCEL_ENGINE = 'calamine' if CALAMINE_AVAILABLE else 'openpyxl'
+
+# pyarrow's CSV reader is multithreaded; pandas uses it as a read_csv engine
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# orjson parses and serializes JSON several times faster than the json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -55,13 +87,90 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() through orjson, keeping Flask's sorted keys and date format"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 DB_PATH = os.environ.get('DATABASE_PATH', '/app/data/power_monitor.db')
 DATA_DIR = os.environ.get('DATA_DIR', '/app/data')
 
+VERIFY_SSL = os.environ.get('VERIFY_SSL', 'true').lower() != 'false'
+if not VERIFY_SSL:
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Downloaded queue files plus their ETag/Last-Modified validators
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, 'http_cache')
+
+# Projects parsed from each source file, keyed by the file's SHA-256
+PARSED_CACHE_DIR = os.path.join(DATA_DIR, 'parsed_cache')
+PARSED_CACHE_TTL = 7 * 24 * 3600
+
+# gridstatus queues are re-downloaded at most this often (seconds)
+GRIDSTATUS_CACHE_TTL = int(os.environ.get('GRIDSTATUS_CACHE_TTL', 6 * 3600))
+
+# Fixed browser UA, built once at import instead of per request
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Header combinations Berkeley Lab downloads are retried with, most browser-like first
+BERKELEY_LAB_HEADER_SETS = (
+    {
+        'User-Agent': USER_AGENT,
+        'Referer': 'https://emp.lbl.gov/queues',
+        'Accept': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet,application/vnd.ms-excel,*/*',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Origin': 'https://emp.lbl.gov',
+    },
+    {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
+        'Referer': 'https://emp.lbl.gov/queues',
+        'Accept': '*/*',
+    },
+    {
+        'User-Agent': 'curl/7.88.1',
+        'Accept': '*/*',
+    },
+)
+
 
 # =============================================================================
 # Database
 # =============================================================================
+# Trigram full-text index behind the /projects search box, kept in step with
+# projects by triggers; the scan's upserts fire the UPDATE trigger
+SEARCH_INDEX_SQL = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_search USING fts5(
+        project_name, customer, county,
+        content='projects', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS projects_search_insert AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_search (rowid, project_name, customer, county)
+        VALUES (new.id, new.project_name, new.customer, new.county);
+    END;
+    CREATE TRIGGER IF NOT EXISTS projects_search_delete AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_search (projects_search, rowid, project_name, customer, county)
+        VALUES ('delete', old.id, old.project_name, old.customer, old.county);
+    END;
+    CREATE TRIGGER IF NOT EXISTS projects_search_update
+    AFTER UPDATE OF project_name, customer, county ON projects BEGIN
+        INSERT INTO projects_search (projects_search, rowid, project_name, customer, county)
+        VALUES ('delete', old.id, old.project_name, old.customer, old.county);
+        INSERT INTO projects_search (rowid, project_name, customer, county)
+        VALUES (new.id, new.project_name, new.customer, new.county);
+    END;
+'''
+
+
 class Database:
     def __init__(self, db_path):
         self.db_path = db_path
@@ -71,12 +180,24 @@ class Database:
     def _get_conn(self):
         if not hasattr(self.local, 'conn') or self.local.conn is None:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            self.local.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # A larger statement cache keeps the scan's upserts and every route's
+            # queries compiled for the life of the connection. One connection per
+            # thread, so gunicorn's threads read side by side under WAL; a write
+            # that meets the scan's transaction waits up to 30s for the lock
+            # instead of failing after the default 5s.
+            self.local.conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                              cached_statements=256, timeout=30)
             self.local.conn.row_factory = sqlite3.Row
+            # Per-connection settings: in WAL mode NORMAL only fsyncs at checkpoints
+            self.local.conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn.execute('PRAGMA temp_store=MEMORY')
+            self.local.conn.execute('PRAGMA cache_size=-65536')
         return self.local.conn
     
     def _init_db(self):
         conn = self._get_conn()
+        # Stored in the database file: readers no longer block the sync's writes
+        conn.execute('PRAGMA journal_mode=WAL')
         conn.executescript('''
             CREATE TABLE IF NOT EXISTS projects (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -94,6 +215,7 @@ class Database:
                 project_type TEXT,
                 hunter_score INTEGER DEFAULT 0,
                 data_hash TEXT,
+                content_hash BLOB,
                 first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
@@ -128,125 +250,735 @@ class Database:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
             
-            CREATE INDEX IF NOT EXISTS idx_projects_utility ON projects(utility);
-            CREATE INDEX IF NOT EXISTS idx_projects_state ON projects(state);
-            CREATE INDEX IF NOT EXISTS idx_projects_type ON projects(project_type);
-            CREATE INDEX IF NOT EXISTS idx_projects_score ON projects(hunter_score);
+            -- Small values remembered between syncs, such as a working mirror URL
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            
+            -- Manual and API syncs, shared by every web worker and the scheduler
+            CREATE TABLE IF NOT EXISTS scan_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                result TEXT,
+                error TEXT
+            );
+            
+            -- Covers the dashboard's per-utility count and MW totals
+            DROP INDEX IF EXISTS idx_projects_utility;
+            CREATE INDEX IF NOT EXISTS idx_projects_utility_capacity ON projects(utility, capacity_mw);
+            -- Matches the ORDER BY of /projects, /export and /api/projects so
+            -- SQLite can walk the index instead of sorting the whole table
+            DROP INDEX IF EXISTS idx_projects_score;
+            CREATE INDEX IF NOT EXISTS idx_projects_score_capacity ON projects(hunter_score DESC, capacity_mw DESC);
+            -- Same ordering behind the state and datacenter filters of /projects
+            DROP INDEX IF EXISTS idx_projects_state;
+            CREATE INDEX IF NOT EXISTS idx_projects_state_score ON projects(state, hunter_score DESC, capacity_mw DESC);
+            DROP INDEX IF EXISTS idx_projects_type;
+            CREATE INDEX IF NOT EXISTS idx_projects_type_score ON projects(project_type, hunter_score DESC, capacity_mw DESC);
+            -- Dashboard "recently discovered" list
+            CREATE INDEX IF NOT EXISTS idx_projects_first_seen ON projects(first_seen);
+            -- Covers the per-source last sync and totals on /monitoring, so the
+            -- GROUP BY reads the index in order instead of sorting the whole log
+            CREATE INDEX IF NOT EXISTS idx_sync_log_source_time ON sync_log(source, sync_time, projects_found);
+            -- Newest-first run lists on / and /monitoring, read backwards off
+            -- the index instead of sorting every run ever logged
+            CREATE INDEX IF NOT EXISTS idx_monitor_runs_date ON monitor_runs(run_date);
         ''')
+        # Databases created before content_hash was added
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(projects)')}
+        if 'content_hash' not in columns:
+            conn.execute('ALTER TABLE projects ADD COLUMN content_hash BLOB')
         conn.commit()
+        # The trigram tokenizer needs SQLite 3.34+; without it search falls
+        # back to LIKE over the table
+        try:
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'projects_search'").fetchone()
+            conn.executescript(SEARCH_INDEX_SQL)
+            if not exists:
+                # Index the projects stored before the search table existed
+                conn.execute("INSERT INTO projects_search (projects_search) VALUES ('rebuild')")
+                conn.commit()
+            self.search_index = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Search index unavailable, using LIKE: {e}")
+            self.search_index = False
     
     def execute(self, query, params=()):
         conn = self._get_conn()
         cursor = conn.execute(query, params)
         conn.commit()
         return cursor
-    
+
+    def executemany(self, query, seq_of_params):
+        with self.transaction() as conn:
+            return conn.executemany(query, seq_of_params)
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one commit, rolled back if any fails"""
+        conn = self._get_conn()
+        with conn:
+            yield conn
+
     def fetchall(self, query, params=()):
         return self._get_conn().execute(query, params).fetchall()
     
     def fetchone(self, query, params=()):
         return self._get_conn().execute(query, params).fetchone()
+    
+    def iterate(self, query, params=()):
+        """Rows of query as they are stepped through, without fetching them all"""
+        return self._get_conn().execute(query, params)
+    
+    def get_setting(self, key, default=None):
+        row = self.fetchone('SELECT value FROM settings WHERE key = ?', (key,))
+        return row['value'] if row else default
+    
+    def set_setting(self, key, value):
+        self.execute('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', (key, value))
 
 
 db = Database(DB_PATH)
 
 
+# Queue fields read by the DataFrame fetchers: (source columns in priority
+# order, default when none is present). A default of None means the row index.
+CAISO_FIELDS = {
+    'id': (['Queue ID'], None),
+    'name': (['Project Name'], 'Unknown'),
+    'county': (['County'], ''),
+    'customer': (['Interconnection Customer'], ''),
+    'status': (['Status'], 'Active'),
+    'fuel': (['Fuel'], ''),
+}
+NYISO_FIELDS = {
+    'id': (['Queue Position'], None),
+    'name': (['Project Name', 'Proposed Name'], 'Unknown'),
+    'county': (['County'], ''),
+    'customer': (['Developer'], ''),
+    'status': (['Status'], 'Active'),
+    'fuel': (['Type'], ''),
+}
+SPP_FIELDS = {
+    'id': (['Generation Interconnection Number'], None),
+    'name': (['Project Name'], 'Unknown'),
+    'county': ([' Nearest Town or County'], ''),
+    'state': (['State'], ''),
+    'status': (['Status'], 'Active'),
+    'fuel': (['Fuel Type', 'Generation Type'], ''),
+}
+MISO_GRIDSTATUS_FIELDS = {
+    'id': (['Queue ID', 'jNumber'], None),
+    'name': (['Project Name', 'projectName'], 'Unknown'),
+    'county': (['County', 'county'], ''),
+    'state': (['State', 'state'], ''),
+    'customer': (['Interconnecting Entity', 'interconnectionEntity'], ''),
+    'status': (['Status', 'status'], 'Active'),
+    'fuel': (['Fuel Type', 'fuelType'], ''),
+}
+ISONE_FIELDS = {
+    'id': (['QP'], None),
+    'name': (['Alternative Name', 'Unit'], 'Unknown'),
+    'county': (['County'], ''),
+    'state': (['ST'], 'MA'),
+    'status': (['Status'], 'Active'),
+    'fuel': (['Fuel Type'], ''),
+}
+ERCOT_FIELDS = {
+    'id': (['Queue ID'], None),
+    'name': (['Project Name'], 'Unknown'),
+    'county': (['County'], ''),
+    'customer': (['Interconnecting Entity'], ''),
+    'status': (['Status'], 'Active'),
+    'fuel': (['Fuel', 'Technology'], ''),
+}
+
+# NYISO queue columns fetch_nyiso reads besides the MW ones; the rest of the
+# sheet (dates, coordinates, study milestones) is never parsed
+NYISO_COLUMNS = frozenset(col for candidates, _ in NYISO_FIELDS.values() for col in candidates)
+
+
+def nyiso_column(name):
+    return name in NYISO_COLUMNS or 'MW' in str(name).upper()
+
+
+# Candidate source columns per canonical field, in priority order
+MISO_FIELDS = {
+    'id': ['jNumber', 'queueNumber', 'Queue Number'],
+    'name': ['projectName', 'name', 'Project Name'],
+    'county': ['county', 'County'],
+    'state': ['state', 'State'],
+    'customer': ['interconnectionEntity', 'developer', 'Developer'],
+    'status': ['status', 'queueStatus', 'Status'],
+    'fuel': ['fuelType', 'fuel', 'Fuel Type'],
+}
+MISO_CAPACITY_FIELDS = ['summerNetMW', 'winterNetMW', 'mw', 'MW', 'capacity', 'netMW', 'Capacity']
+
+BERKELEY_LAB_COLUMNS = {
+    'entity': ['entity', 'region', 'iso', 'rto', 'ba'],
+    'mw': ['capacity_mw', 'mw', 'capacity', 'nameplate'],
+    'name': ['project_name', 'project', 'name'],
+    'id': ['queue_id', 'request_id', 'queue_pos', 'position'],
+    'state': ['state'],
+    'county': ['county'],
+    'status': ['queue_status', 'status'],
+    'fuel': ['resource_type', 'resource', 'fuel', 'type', 'technology'],
+    'developer': ['developer', 'interconnection', 'owner', 'applicant'],
+}
+
+
+def resolve_columns(columns, candidates, exact=False):
+    """Map each canonical field to the first candidate present in columns.
+
+    By default a candidate matches any column whose name contains it,
+    ignoring case; with exact=True the names must be equal. Fields with no
+    match map to None.
+    """
+    columns = list(columns)
+    lowered = [str(c).lower() for c in columns]
+    resolved = {}
+    for field, names in candidates.items():
+        resolved[field] = None
+        for name in names:
+            if exact:
+                match = name if name in columns else None
+            else:
+                match = next((col for col, low in zip(columns, lowered) if name.lower() in low), None)
+            if match is not None:
+                resolved[field] = match
+                break
+    return resolved
+
+
+# str() of an empty spreadsheet cell
+MISSING_TEXT = frozenset({'nan', 'NaN', 'None', 'NaT', '<NA>'})
+COUNTY_SUFFIX_RE = re.compile(r'\s+county$', re.IGNORECASE)
+# First number in capacity text such as "150 (summer)"
+CAPACITY_NUMBER_RE = re.compile(r'(\d+\.?\d*)')
+
+
+def coalesce_columns(df, columns):
+    """Per row, the first of columns with a value, skipping blanks and zeros"""
+    result = pd.Series(np.nan, index=df.index, dtype=object)
+    for col in reversed(columns):
+        if col in df.columns:
+            values = df[col]
+            present = values.notna() & (values != 0) & (values != '')
+            result = values.where(present, result)
+    return result
+
+
+def field_columns(df, fields):
+    """Per-row values of each field in fields, as lists in the same order.
+
+    Columns are resolved once per frame, so the row loop just zips the lists
+    instead of looking every field up in a per-row dict. Fields with a
+    default come back as str; the None-default id field keeps raw values.
+    """
+    columns = []
+    for candidates, default in fields.values():
+        col = next((c for c in candidates if c in df.columns), None)
+        if col is not None:
+            values = df[col]
+            if default is not None:
+                # Text fields are converted once per column, and blank cells
+                # take the default instead of turning into the string 'nan'
+                values = values.astype('string').fillna(default)
+            columns.append(values.tolist())
+        elif default is None:
+            columns.append(df.index.tolist())
+        else:
+            columns.append([default] * len(df))
+    return columns
+
+
+def read_spp_csv(path):
+    """Parse SPP's queue CSV from disk, skipping any title lines above the header.
+
+    Only the first few lines are read to find the header; the parser then
+    streams the rest from the file instead of a second in-memory copy.
+    """
+    with open(path, encoding='utf-8', errors='replace') as f:
+        header_offset = 0
+        for _ in range(10):
+            offset = f.tell()
+            line = f.readline()
+            if 'MW' in line or 'Generation' in line:
+                header_offset = offset
+                break
+        f.seek(header_offset)
+        return pd.read_csv(f, engine=CSV_ENGINE)
+
+
+def cell_text(element):
+    """Text of an lxml element, each fragment stripped and joined as BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+def parse_html_table(content):
+    """First <table> of an HTML page as (number of body rows, DataFrame).
+
+    Columns are the table's <th> texts. Only rows with at least that many
+    <td> cells are kept, their cells matched to the headers by position.
+    """
+    root = lxml.html.fromstring(content)
+    table = next(root.iter('table'), None)
+    if table is None:
+        return 0, None
+    headers = [cell_text(th) for th in table.iter('th')]
+    rows = list(table.iter('tr'))[1:]
+    records = []
+    for row in rows:
+        cells = [cell_text(td) for td in row.iter('td')]
+        if len(cells) >= len(headers):
+            records.append(dict(zip(headers, cells)))
+    return len(rows), pd.DataFrame.from_records(records)
+
+
+def json_loads(data):
+    """Parse JSON bytes or text, with orjson when it is installed"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def pack_projects(projects):
+    """Projects as (keys, rows): one shared key tuple and a value tuple per project.
+
+    A source's projects all have the same fields, so long-lived caches keep
+    them this way rather than as a dict each, at a fraction of the memory.
+    """
+    keys = tuple(projects[0]) if projects else ()
+    return keys, [tuple(p[k] for k in keys) for p in projects]
+
+
+def unpack_projects(packed):
+    """Fresh project dicts from pack_projects output"""
+    keys, rows = packed
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def file_digest(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(values):
+    """Short digest of a stored row, used to skip rewriting unchanged projects.
+
+    Kept as the raw 16 bytes rather than hex, which would double its width
+    in every row.
+    """
+    text = '\x1f'.join('' if v is None else str(v) for v in values)
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def create_session():
+    """requests.Session shared by all fetchers: browser headers, keep-alive pool, retries"""
+    session = requests.Session()
+    # Certificate checks are on unless VERIFY_SSL=false is set for a host with a broken chain
+    session.verify = VERIFY_SSL
+    # Keep-alive pool per host, with retries on throttling and transient 5xx
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                          raise_on_status=False),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': '*/*',
+        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Language': 'en-US,en;q=0.9',
+    })
+    return session
+
+
+# One connection pool per process, so every monitor instance reuses open connections
+http_session = create_session()
+
+
+def keyword_pattern(keywords):
+    """Compile a list of literal keywords into a single alternation regex"""
+    return re.compile('|'.join(re.escape(kw) for kw in keywords))
+
+
+def contains_pattern(series, pattern):
+    """Boolean array: does each string in series match pattern?
+
+    Queue rows repeat the same developer, county and fuel strings heavily, so
+    each distinct string is searched once and the result broadcast back.
+    """
+    codes, uniques = pd.factorize(series)
+    matched = np.append(np.asarray(uniques.str.contains(pattern), dtype=bool), False)
+    return matched[codes]  # code -1 (missing) picks the trailing False
+
+
+def first_match(series, labelled_patterns, default):
+    """Array of the label of the first (label, pattern) matching each string.
+
+    Like contains_pattern, every distinct string is searched once; the
+    factorization is shared by all the patterns rather than redone per pattern.
+    """
+    codes, uniques = pd.factorize(series)
+    conditions = [np.asarray(uniques.str.contains(pattern), dtype=bool) for _, pattern in labelled_patterns]
+    labels = np.select(conditions, [label for label, _ in labelled_patterns], default=default)
+    return np.append(labels, default)[codes]  # code -1 (missing) picks the default
+
+
+# Berkeley Lab entity/region text -> utility, first match wins
+ENTITY_UTILITY_PATTERNS = [
+    ('PJM', keyword_pattern(['PJM'])),
+    ('MISO', keyword_pattern(['MISO'])),
+    ('CAISO', keyword_pattern(['CAISO', 'CALIFORNIA'])),
+    ('ERCOT', keyword_pattern(['ERCOT', 'TEXAS'])),
+    ('SPP', keyword_pattern(['SPP'])),
+    ('NYISO', keyword_pattern(['NYISO', 'NEW YORK'])),
+    ('ISO-NE', keyword_pattern(['ISO-NE', 'ISONE', 'NEW ENGLAND'])),
+]
+
+
 # =============================================================================
 # Power Monitor Class
 # =============================================================================
 class HybridPowerMonitor:
     """Complete power monitor with all 7 ISOs + Berkeley Lab backup"""
     
+    # Unit suffixes stripped from capacity text before parsing
+    CAPACITY_SUFFIXES = ('MW', 'mw', 'Mw', 'MEGAWATT')
+
     def __init__(self, min_capacity_mw=100):
         self.min_capacity_mw = min_capacity_mw
-        self.session = requests.Session()
-        self.session.verify = False
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': '*/*',
-            'Accept-Language': 'en-US,en;q=0.9',
-        })
+        self.session = http_session
         self.berkeley_lab_cache = {}  # Cache by utility
+        self.parsed_cache = {}  # source -> (content digest, packed parsed projects)
+        self.gridstatus_cache = {}  # ISO class name -> (fetch time, queue DataFrame)
     
     def extract_capacity(self, value):
-        if pd.isna(value) or value is None or value == '':
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Numeric cells need no text parsing; NaN fails the comparison
+            return float(value) if value >= self.min_capacity_mw else None
+        if value is None or pd.isna(value) or value == '':
             return None
         text = str(value).replace(',', '').strip()
-        for suffix in ['MW', 'mw', 'Mw', 'MEGAWATT']:
+        for suffix in self.CAPACITY_SUFFIXES:
             text = text.replace(suffix, '')
         text = text.strip()
         try:
             capacity = float(text)
-            return capacity if capacity >= self.min_capacity_mw else None
         except ValueError:
-            match = re.search(r'(\d+\.?\d*)', text)
-            if match:
-                try:
-                    return float(match.group(1)) if float(match.group(1)) >= self.min_capacity_mw else None
-                except:
-                    pass
-        return None
+            match = CAPACITY_NUMBER_RE.search(text)
+            if not match:
+                return None
+            capacity = float(match.group(1))
+        return capacity if capacity >= self.min_capacity_mw else None
+    
+    def map_entities(self, entities):
+        """Vectorized Berkeley Lab entity/region -> utility name"""
+        entity = entities.astype(str).str.upper()
+        utilities = first_match(entity, ENTITY_UTILITY_PATTERNS, '')
+        fallback = entity.str[:20].where(entity != '', 'Other')
+        return pd.Series(np.where(utilities != '', utilities, fallback.to_numpy()), index=entities.index)
+    
+    def extract_capacities(self, values):
+        """Vectorized extract_capacity over a Series; NaN where it would return None"""
+        if pd.api.types.is_numeric_dtype(values):
+            capacity = values.astype(float)
+        else:
+            text = values.astype(str).str.replace(',', '', regex=False).str.strip()
+            for suffix in self.CAPACITY_SUFFIXES:
+                text = text.str.replace(suffix, '', regex=False)
+            text = text.str.strip()
+            capacity = pd.to_numeric(text, errors='coerce')
+            # Fall back to the first number in strings like "150 (summer)"
+            capacity = capacity.fillna(text.str.extract(CAPACITY_NUMBER_RE, expand=False).astype(float))
+            capacity[values.isna() | (values == '')] = np.nan
+        return capacity.where(capacity >= self.min_capacity_mw)
+    
+    def first_capacity(self, df, columns):
+        """Per row, the first of columns holding a valid capacity (NaN if none)"""
+        capacity = pd.Series(np.nan, index=df.index)
+        for col in columns:
+            if col in df.columns:
+                capacity = capacity.fillna(self.extract_capacities(df[col]))
+        return capacity
+    
+    def queue_projects(self, df, capacities, fields, utility, source_url, prefix=None, state=''):
+        """Project dicts for the rows of a queue frame that have a capacity.
+
+        fields maps id/name/county/status/fuel, plus optionally customer and
+        state, to candidate columns as in CAISO_FIELDS. Without a state field
+        every project gets state; request_ids are prefix (default utility)
+        plus the queue id.
+        """
+        keep = capacities.notna()
+        df, capacities = df[keep], capacities[keep]
+        values = dict(zip(fields, field_columns(df, fields)))
+        customers = values.get('customer', [''] * len(df))
+        states = values.get('state', [state] * len(df))
+        prefix = prefix or utility
+        projects = []
+        for queue_id, name, county, project_state, customer, status, fuel, capacity in zip(
+                values['id'], values['name'], values['county'], states, customers,
+                values['status'], values['fuel'], capacities.tolist()):
+            data = {
+                'request_id': f"{prefix}_{queue_id}",
+                'project_name': name[:500],
+                'capacity_mw': capacity,
+                'county': county[:200],
+                'state': project_state[:2],
+                'customer': customer[:500],
+                'utility': utility,
+                'status': status,
+                'fuel_type': fuel,
+                'source': utility,
+                'source_url': source_url,
+            }
+            data['data_hash'] = self.generate_hash(data)
+            projects.append(data)
+        return projects
     
     def generate_hash(self, data):
-        key = f"{data.get('project_name', '')}_{data.get('capacity_mw', 0)}_{data.get('state', '')}_{data.get('utility', '')}"
-        return hashlib.md5(key.lower().encode()).hexdigest()
+        # '|' cannot be confused with the underscores common in project names;
+        # an 8-byte blake2b is ample for identifying a project and half MD5's width
+        key = f"{data.get('project_name', '')}|{data.get('capacity_mw', 0)}|{data.get('state', '')}|{data.get('utility', '')}"
+        return hashlib.blake2b(key.lower().encode(), digest_size=8).hexdigest()
     
     def classify_project(self, name, customer='', fuel_type=''):
         text = f"{name} {customer} {fuel_type}".lower()
-        if any(kw in text for kw in ['data center', 'datacenter', 'cloud', 'hyperscale', 'colocation', 'microsoft', 'amazon', 'google', 'meta', 'aws', 'facebook']):
-            return 'datacenter'
-        if any(kw in text for kw in ['battery', 'storage', 'bess', 'energy storage']):
-            return 'storage'
-        if any(kw in text for kw in ['solar', 'photovoltaic', 'pv ']):
-            return 'solar'
-        if any(kw in text for kw in ['wind', 'offshore']):
-            return 'wind'
-        if any(kw in text for kw in ['natural gas', 'gas turbine', 'combined cycle', 'peaker', 'ccgt']):
-            return 'gas'
-        if any(kw in text for kw in ['nuclear']):
-            return 'nuclear'
+        for project_type, pattern in self.PROJECT_TYPE_PATTERNS:
+            if pattern.search(text):
+                return project_type
         return 'other'
     
+    def classify_projects(self, df):
+        """Vectorized classify_project over a DataFrame of projects"""
+        text = (df['project_name'].astype(str) + ' ' + df['customer'].astype(str)
+                + ' ' + df['fuel_type'].astype(str)).str.lower()
+        return pd.Series(first_match(text, self.PROJECT_TYPE_PATTERNS, 'other'), index=df.index)
+    
+    # Hunter score signals, shared by the scalar and vectorized scorers
+    DC_KEYWORDS = ['data center', 'datacenter', 'hyperscale', 'colocation', 'colo ', 'server farm']
+    TECH_COMPANIES = ['microsoft', 'amazon', 'aws', 'google', 'meta', 'facebook', 'apple', 'oracle', 'ibm',
+                      'digital realty', 'equinix', 'cyrusone', 'qts', 'coresite', 'vantage', 'cloudflare']
+    LOAD_KEYWORDS = ['load', 'behind meter', 'btm', 'campus']
+    HOTSPOTS = {
+        'VA': ['loudoun', 'prince william', 'fairfax'],
+        'CA': ['santa clara'],
+        'AZ': ['maricopa'],
+        'GA': ['douglas'],
+        'TX': ['dallas', 'fort worth'],
+    }
+
+    # Each keyword list compiled into one alternation so a string is scanned
+    # once by the regex engine instead of once per keyword
+    DC_PATTERN = keyword_pattern(DC_KEYWORDS)
+    TECH_PATTERN = keyword_pattern(TECH_COMPANIES)
+    LOAD_PATTERN = keyword_pattern(LOAD_KEYWORDS)
+    HOTSPOT_PATTERNS = {state: keyword_pattern(counties) for state, counties in HOTSPOTS.items()}
+
+    # First match wins, in this order
+    PROJECT_TYPE_PATTERNS = [
+        ('datacenter', keyword_pattern(['data center', 'datacenter', 'cloud', 'hyperscale', 'colocation',
+                                        'microsoft', 'amazon', 'google', 'meta', 'aws', 'facebook'])),
+        ('storage', keyword_pattern(['battery', 'storage', 'bess', 'energy storage'])),
+        ('solar', keyword_pattern(['solar', 'photovoltaic', 'pv '])),
+        ('wind', keyword_pattern(['wind', 'offshore'])),
+        ('gas', keyword_pattern(['natural gas', 'gas turbine', 'combined cycle', 'peaker', 'ccgt'])),
+        ('nuclear', keyword_pattern(['nuclear'])),
+    ]
+
     def calculate_hunter_score(self, project):
         """Calculate datacenter likelihood score (0-100)"""
-        score = 0
         name = (project.get('project_name', '') + ' ' + project.get('customer', '')).lower()
-        
+        county = project.get('county', '').lower()
+        state = project.get('state', '').upper()
+        capacity = project.get('capacity_mw', 0) or 0
+        capacity_tier = 2 if capacity >= 500 else 1 if capacity >= 200 else 0
+        return self._score_signature(name, county, state, capacity_tier)
+
+    @classmethod
+    @lru_cache(maxsize=65536)
+    def _score_signature(cls, name, county, state, capacity_tier):
+        # Developers file many near-identical requests, so normalized
+        # signatures repeat often enough to be worth memoizing
+        score = 0
+
         # Direct datacenter indicators (+40)
-        dc_keywords = ['data center', 'datacenter', 'hyperscale', 'colocation', 'colo ', 'server farm']
-        if any(kw in name for kw in dc_keywords):
+        if cls.DC_PATTERN.search(name):
             score += 40
-        
+
         # Tech company names (+35)
-        tech_companies = ['microsoft', 'amazon', 'aws', 'google', 'meta', 'facebook', 'apple', 'oracle', 'ibm', 
-                         'digital realty', 'equinix', 'cyrusone', 'qts', 'coresite', 'vantage', 'cloudflare']
-        if any(co in name for co in tech_companies):
+        if cls.TECH_PATTERN.search(name):
             score += 35
-        
+
         # Datacenter hotspot locations (+15)
-        county = project.get('county', '').lower()
-        state = project.get('state', '').upper()
-        hotspots = [
-            ('loudoun', 'VA'), ('prince william', 'VA'), ('fairfax', 'VA'),
-            ('santa clara', 'CA'), ('maricopa', 'AZ'), ('douglas', 'GA'),
-            ('dallas', 'TX'), ('fort worth', 'TX'),
-        ]
-        if any(h[0] in county and h[1] == state for h in hotspots):
+        hotspot = cls.HOTSPOT_PATTERNS.get(state)
+        if hotspot and hotspot.search(county):
             score += 15
-        
-        # High capacity bonus (+10)
-        capacity = project.get('capacity_mw', 0)
-        if capacity >= 500:
-            score += 10
-        elif capacity >= 200:
-            score += 5
-        
+
+        # High capacity bonus (+10 for 500MW+, +5 for 200MW+)
+        score += (0, 5, 10)[capacity_tier]
+
         # Load-only indicators (+20)
-        if any(kw in name for kw in ['load', 'behind meter', 'btm', 'campus']):
+        if cls.LOAD_PATTERN.search(name):
             score += 20
-        
+
         return min(score, 100)
 
+    def calculate_hunter_scores(self, df):
+        """Vectorized calculate_hunter_score over a DataFrame of projects"""
+        def text(col):
+            return df[col].fillna('').astype(str)
+
+        name = (text('project_name') + ' ' + text('customer')).str.lower()
+        county = text('county').str.lower()
+        state = text('state').str.upper()
+        capacity = pd.to_numeric(df['capacity_mw'], errors='coerce').fillna(0).to_numpy()
+
+        hotspot = np.zeros(len(df), dtype=bool)
+        for hot_state, pattern in self.HOTSPOT_PATTERNS.items():
+            hotspot |= (state == hot_state).to_numpy() & contains_pattern(county, pattern)
+
+        score = (
+            40 * contains_pattern(name, self.DC_PATTERN)
+            + 35 * contains_pattern(name, self.TECH_PATTERN)
+            + 15 * hotspot
+            + np.select([capacity >= 500, capacity >= 200], [10, 5], default=0)
+            + 20 * contains_pattern(name, self.LOAD_PATTERN)
+        )
+        return pd.Series(np.minimum(score, 100), index=df.index)
+
+    def conditional_download(self, url, **kwargs):
+        """Stream url to a file under HTTP_CACHE_DIR, revalidating any earlier copy.
+
+        Sends If-None-Match/If-Modified-Since when validators were saved, and
+        writes the body in chunks so large workbooks are never held in memory.
+        Returns (path, changed). path is None if the download failed; changed
+        is False when the server answered 304 and the earlier copy is reused.
+        """
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        body_path = os.path.join(HTTP_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest())
+        meta_path = body_path + '.json'
+        headers = dict(kwargs.pop('headers', None) or {})
+
+        meta = {}
+        if os.path.exists(body_path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        with self.session.get(url, headers=headers, stream=True, **kwargs) as response:
+            if response.status_code == 304 and meta:
+                return body_path, False
+            if response.status_code != 200:
+                logger.warning(f"HTTP {response.status_code} for {url}")
+                return None, False
+
+            tmp_path = body_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    f.write(chunk)
+            os.replace(tmp_path, body_path)
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                with open(meta_path, 'w') as f:
+                    json.dump({'url': url, 'etag': etag, 'last_modified': last_modified}, f)
+            elif os.path.exists(meta_path):
+                os.remove(meta_path)
+        return body_path, True
+
+    def available_first(self, urls, **kwargs):
+        """urls reordered so those answering a HEAD request with 200 come first.
+
+        The probes run side by side, so dead mirrors cost one short timeout in
+        total instead of a full download timeout each; order is otherwise kept.
+        """
+        def probe(url):
+            try:
+                return self.session.head(url, allow_redirects=True, timeout=15, **kwargs).status_code == 200
+            except requests.exceptions.RequestException:
+                return False
+
+        with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+            live = list(pool.map(probe, urls))
+        return [url for url, ok in zip(urls, live) if ok] + [url for url, ok in zip(urls, live) if not ok]
+
+    def berkeley_lab_urls(self, urls, **kwargs):
+        """Berkeley Lab URLs to try: the last one that worked, then the live ones.
+
+        A generator, so the HEAD probes of the other mirrors only run if the
+        remembered URL fails; usually the first download is the only request.
+        """
+        remembered = db.get_setting('berkeley_lab_url')
+        if remembered in urls:
+            yield remembered
+            urls = [url for url in urls if url != remembered]
+        yield from self.available_first(urls, **kwargs)
+    
+    def gridstatus_queue(self, iso):
+        """gridstatus interconnection queue for iso ('CAISO', 'Ercot', 'MISO').
+
+        gridstatus downloads and parses the whole upstream file on every call,
+        and the queues change at most daily, so a frame is reused for
+        GRIDSTATUS_CACHE_TTL. Callers get a copy they are free to modify.
+        """
+        fetched_at, df = self.gridstatus_cache.get(iso, (0, None))
+        if df is None or time.time() - fetched_at > GRIDSTATUS_CACHE_TTL:
+            df = getattr(gridstatus, iso)().get_interconnection_queue()
+            self.gridstatus_cache[iso] = (time.time(), df)
+        else:
+            logger.info(f"{iso}: Reusing gridstatus queue from {(time.time() - fetched_at) / 60:.0f} min ago")
+        return df.copy()
+
+    def cached_projects(self, source, digest):
+        """Copies of the projects parsed earlier from a file with this content hash.
+
+        Checks memory first, then the JSON copy under PARSED_CACHE_DIR so an
+        unchanged file is not re-parsed after a restart either.
+        """
+        cached_digest, packed = self.parsed_cache.get(source, (None, None))
+        if cached_digest != digest:
+            path = os.path.join(PARSED_CACHE_DIR, f"{source}_{digest}.json")
+            try:
+                if time.time() - os.path.getmtime(path) > PARSED_CACHE_TTL:
+                    return None
+                with open(path) as f:
+                    projects = json.load(f)
+            except (OSError, ValueError):
+                return None
+            packed = pack_projects(projects)
+            self.parsed_cache[source] = (digest, packed)
+        return unpack_projects(packed)
+
+    def store_parsed(self, source, digest, projects):
+        """Remember the projects parsed from a file, replacing older versions"""
+        self.parsed_cache[source] = (digest, pack_projects(projects))
+        os.makedirs(PARSED_CACHE_DIR, exist_ok=True)
+        for name in os.listdir(PARSED_CACHE_DIR):
+            if name.startswith(f"{source}_"):
+                os.remove(os.path.join(PARSED_CACHE_DIR, name))
+        tmp_path = os.path.join(PARSED_CACHE_DIR, f".{source}_{digest}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(projects, f)
+        os.replace(tmp_path, os.path.join(PARSED_CACHE_DIR, f"{source}_{digest}.json"))
+
     # =========================================================================
     # CAISO
     # =========================================================================
@@ -257,30 +989,11 @@ class HybridPowerMonitor:
             return projects
         try:
             logger.info("CAISO: Fetching via gridstatus")
-            caiso = gridstatus.CAISO()
-            df = caiso.get_interconnection_queue()
+            df = self.gridstatus_queue('CAISO')
             logger.info(f"CAISO: Found {len(df)} rows")
             
-            for _, row in df.iterrows():
-                capacity = self.extract_capacity(row.get('Capacity (MW)', 0))
-                if capacity:
-                    data = {
-                        'request_id': f"CAISO_{row.get('Queue ID', row.name)}",
-                        'project_name': str(row.get('Project Name', 'Unknown'))[:500],
-                        'capacity_mw': capacity,
-                        'county': str(row.get('County', ''))[:200],
-                        'state': 'CA',
-                        'customer': str(row.get('Interconnection Customer', ''))[:500],
-                        'utility': 'CAISO',
-                        'status': str(row.get('Status', 'Active')),
-                        'fuel_type': str(row.get('Fuel', '')),
-                        'source': 'CAISO',
-                        'source_url': 'gridstatus',
-                        'project_type': self.classify_project(str(row.get('Project Name', '')), str(row.get('Interconnection Customer', '')), str(row.get('Fuel', '')))
-                    }
-                    data['hunter_score'] = self.calculate_hunter_score(data)
-                    data['data_hash'] = self.generate_hash(data)
-                    projects.append(data)
+            capacities = self.first_capacity(df, ['Capacity (MW)'])
+            projects = self.queue_projects(df, capacities, CAISO_FIELDS, 'CAISO', 'gridstatus', state='CA')
             logger.info(f"CAISO: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"CAISO failed: {e}")
@@ -294,36 +1007,20 @@ class HybridPowerMonitor:
         url = 'https://www.nyiso.com/documents/20142/1407078/NYISO-Interconnection-Queue.xlsx'
         try:
             logger.info(f"NYISO: Fetching from {url}")
-            response = self.session.get(url, timeout=60)
-            if response.status_code == 200:
-                df = pd.read_excel(BytesIO(response.content))
+            path, _ = self.conditional_download(url, timeout=60)
+            if path is not None:
+                digest = file_digest(path)
+                cached = self.cached_projects('NYISO', digest)
+                if cached is not None:
+                    logger.info(f"NYISO: Content unchanged, reusing {len(cached)} parsed projects")
+                    return cached
+                df = pd.read_excel(path, engine=EXCEL_ENGINE, usecols=nyiso_column)
                 logger.info(f"NYISO: Found {len(df)} rows")
                 mw_cols = [c for c in df.columns if 'MW' in str(c).upper()]
                 
-                for _, row in df.iterrows():
-                    capacity = None
-                    for col in mw_cols:
-                        capacity = self.extract_capacity(row.get(col))
-                        if capacity:
-                            break
-                    if capacity:
-                        data = {
-                            'request_id': f"NYISO_{row.get('Queue Position', row.name)}",
-                            'project_name': str(row.get('Project Name', row.get('Proposed Name', 'Unknown')))[:500],
-                            'capacity_mw': capacity,
-                            'county': str(row.get('County', ''))[:200],
-                            'state': 'NY',
-                            'customer': str(row.get('Developer', ''))[:500],
-                            'utility': 'NYISO',
-                            'status': str(row.get('Status', 'Active')),
-                            'fuel_type': str(row.get('Type', '')),
-                            'source': 'NYISO',
-                            'source_url': url,
-                            'project_type': self.classify_project(str(row.get('Project Name', '')), '', str(row.get('Type', '')))
-                        }
-                        data['hunter_score'] = self.calculate_hunter_score(data)
-                        data['data_hash'] = self.generate_hash(data)
-                        projects.append(data)
+                capacities = self.first_capacity(df, mw_cols)
+                projects = self.queue_projects(df, capacities, NYISO_FIELDS, 'NYISO', url, state='NY')
+                self.store_parsed('NYISO', digest, projects)
                 logger.info(f"NYISO: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"NYISO failed: {e}")
@@ -337,43 +1034,24 @@ class HybridPowerMonitor:
         url = 'https://irtt.iso-ne.com/reports/external'
         try:
             logger.info(f"ISO-NE: Fetching from {url}")
-            response = self.session.get(url, timeout=60)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                table = soup.find('table')
-                if table:
-                    headers = [th.get_text(strip=True) for th in table.find_all('th')]
-                    rows = table.find_all('tr')[1:]
-                    logger.info(f"ISO-NE: Found {len(rows)} rows")
+            path, _ = self.conditional_download(url, timeout=60)
+            if path is not None:
+                digest = file_digest(path)
+                cached = self.cached_projects('ISO-NE', digest)
+                if cached is not None:
+                    logger.info(f"ISO-NE: Content unchanged, reusing {len(cached)} parsed projects")
+                    return cached
+                with open(path, 'rb') as f:
+                    row_count, df = parse_html_table(f.read())
+                if df is not None:
+                    logger.info(f"ISO-NE: Found {row_count} rows")
                     
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= len(headers):
-                            row_data = {headers[i]: cells[i].get_text(strip=True) for i in range(len(headers))}
-                            capacity = None
-                            for mw_col in ['Net MW', 'Summer MW', 'Winter MW', 'MW']:
-                                if mw_col in row_data:
-                                    capacity = self.extract_capacity(row_data.get(mw_col))
-                                    if capacity:
-                                        break
-                            if capacity:
-                                data = {
-                                    'request_id': f"ISONE_{row_data.get('QP', len(projects))}",
-                                    'project_name': str(row_data.get('Alternative Name', row_data.get('Unit', 'Unknown')))[:500],
-                                    'capacity_mw': capacity,
-                                    'county': str(row_data.get('County', ''))[:200],
-                                    'state': str(row_data.get('ST', 'MA'))[:2],
-                                    'customer': '',
-                                    'utility': 'ISO-NE',
-                                    'status': str(row_data.get('Status', 'Active')),
-                                    'fuel_type': str(row_data.get('Fuel Type', '')),
-                                    'source': 'ISO-NE',
-                                    'source_url': url,
-                                    'project_type': self.classify_project(row_data.get('Alternative Name', ''), '', row_data.get('Fuel Type', ''))
-                                }
-                                data['hunter_score'] = self.calculate_hunter_score(data)
-                                data['data_hash'] = self.generate_hash(data)
-                                projects.append(data)
+                    capacities = self.first_capacity(df, ['Net MW', 'Summer MW', 'Winter MW', 'MW'])
+                    # Renumber so rows without a QP fall back to their position among the kept rows
+                    keep = capacities.notna().to_numpy()
+                    df, capacities = df[keep].reset_index(drop=True), capacities[keep].reset_index(drop=True)
+                    projects = self.queue_projects(df, capacities, ISONE_FIELDS, 'ISO-NE', url, prefix='ISONE')
+                    self.store_parsed('ISO-NE', digest, projects)
                     logger.info(f"ISO-NE: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"ISO-NE failed: {e}")
@@ -387,43 +1065,20 @@ class HybridPowerMonitor:
         url = 'https://opsportal.spp.org/Studies/GenerateActiveCSV'
         try:
             logger.info(f"SPP: Fetching from {url}")
-            response = self.session.get(url, timeout=60)
-            if response.status_code == 200:
-                lines = response.text.split('\n')
-                header_idx = 0
-                for i, line in enumerate(lines[:10]):
-                    if 'MW' in line or 'Generation' in line:
-                        header_idx = i
-                        break
-                csv_data = '\n'.join(lines[header_idx:])
-                df = pd.read_csv(StringIO(csv_data))
+            path, _ = self.conditional_download(url, timeout=60)
+            if path is not None:
+                digest = file_digest(path)
+                cached = self.cached_projects('SPP', digest)
+                if cached is not None:
+                    logger.info(f"SPP: Content unchanged, reusing {len(cached)} parsed projects")
+                    return cached
+                df = read_spp_csv(path)
                 logger.info(f"SPP: Found {len(df)} rows")
                 mw_cols = [c for c in df.columns if 'MW' in str(c).upper()]
                 
-                for _, row in df.iterrows():
-                    capacity = None
-                    for col in mw_cols:
-                        capacity = self.extract_capacity(row.get(col))
-                        if capacity:
-                            break
-                    if capacity:
-                        data = {
-                            'request_id': f"SPP_{row.get('Generation Interconnection Number', row.name)}",
-                            'project_name': str(row.get('Project Name', 'Unknown'))[:500],
-                            'capacity_mw': capacity,
-                            'county': str(row.get(' Nearest Town or County', ''))[:200],
-                            'state': str(row.get('State', ''))[:2],
-                            'customer': '',
-                            'utility': 'SPP',
-                            'status': str(row.get('Status', 'Active')),
-                            'fuel_type': str(row.get('Fuel Type', row.get('Generation Type', ''))),
-                            'source': 'SPP',
-                            'source_url': url,
-                            'project_type': self.classify_project(str(row.get('Project Name', '')), '', str(row.get('Fuel Type', '')))
-                        }
-                        data['hunter_score'] = self.calculate_hunter_score(data)
-                        data['data_hash'] = self.generate_hash(data)
-                        projects.append(data)
+                capacities = self.first_capacity(df, mw_cols)
+                projects = self.queue_projects(df, capacities, SPP_FIELDS, 'SPP', url)
+                self.store_parsed('SPP', digest, projects)
                 logger.info(f"SPP: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"SPP failed: {e}")
@@ -451,14 +1106,20 @@ class HybridPowerMonitor:
         url = "https://www.misoenergy.org/api/giqueue/getprojects"
         try:
             logger.info(f"MISO: Fetching from JSON API (v{APP_VERSION})")
-            response = self.session.get(url, timeout=60)
+            path, _ = self.conditional_download(url, timeout=60)
             
-            if response.status_code != 200:
-                logger.error(f"MISO: API returned status {response.status_code}")
-                logger.error(f"MISO: Response text: {response.text[:500]}")
+            if path is None:
+                logger.error("MISO: API request failed")
                 return projects
             
-            data = response.json()
+            digest = file_digest(path)
+            cached = self.cached_projects('MISO', digest)
+            if cached is not None:
+                logger.info(f"MISO: Content unchanged, reusing {len(cached)} parsed projects")
+                return cached
+            
+            with open(path, 'rb') as f:
+                data = json_loads(f.read())
             
             if not data:
                 logger.warning("MISO: API returned empty data")
@@ -474,10 +1135,19 @@ class HybridPowerMonitor:
                 sample_fields = {k: sample.get(k) for k in ['summerNetMW', 'winterNetMW', 'mw', 'MW', 'capacity', 'jNumber', 'projectName'] if k in sample}
                 logger.info(f"MISO: Sample field values: {sample_fields}")
             
+            # Resolve field names once for the whole response instead of
+            # walking a chain of item.get() fallbacks for every project
+            keys = set().union(*(item.keys() for item in data))
+            fields = resolve_columns(keys, MISO_FIELDS, exact=True)
+            capacity_fields = [f for f in MISO_CAPACITY_FIELDS if f in keys]
+
+            def field(item, key, default=''):
+                return item.get(fields[key], default) if fields[key] else default
+
             for item in data:
                 # Try multiple capacity fields
                 capacity = None
-                for cap_field in ['summerNetMW', 'winterNetMW', 'mw', 'MW', 'capacity', 'netMW', 'Capacity']:
+                for cap_field in capacity_fields:
                     cap_val = item.get(cap_field)
                     if cap_val is not None:
                         capacity = self.extract_capacity(cap_val)
@@ -486,34 +1156,29 @@ class HybridPowerMonitor:
                 
                 if capacity:
                     proj = {
-                        'request_id': f"MISO_{item.get('jNumber', item.get('queueNumber', item.get('Queue Number', 'UNK')))}",
-                        'project_name': str(item.get('projectName', item.get('name', item.get('Project Name', 'Unknown'))))[:500],
+                        'request_id': f"MISO_{field(item, 'id', 'UNK')}",
+                        'project_name': str(field(item, 'name', 'Unknown'))[:500],
                         'capacity_mw': capacity,
-                        'county': str(item.get('county', item.get('County', '')))[:200],
-                        'state': str(item.get('state', item.get('State', '')))[:2],
-                        'customer': str(item.get('interconnectionEntity', item.get('developer', item.get('Developer', ''))))[:500],
+                        'county': str(field(item, 'county'))[:200],
+                        'state': str(field(item, 'state'))[:2],
+                        'customer': str(field(item, 'customer'))[:500],
                         'utility': 'MISO',
-                        'status': str(item.get('status', item.get('queueStatus', item.get('Status', 'Active')))),
-                        'fuel_type': str(item.get('fuelType', item.get('fuel', item.get('Fuel Type', '')))),
+                        'status': str(field(item, 'status', 'Active')),
+                        'fuel_type': str(field(item, 'fuel')),
                         'source': 'MISO',
                         'source_url': url,
-                        'project_type': self.classify_project(
-                            item.get('projectName', item.get('Project Name', '')), 
-                            item.get('interconnectionEntity', item.get('Developer', '')), 
-                            item.get('fuelType', item.get('Fuel Type', ''))
-                        )
                     }
-                    proj['hunter_score'] = self.calculate_hunter_score(proj)
                     proj['data_hash'] = self.generate_hash(proj)
                     projects.append(proj)
             
+            self.store_parsed('MISO', digest, projects)
             logger.info(f"MISO: Extracted {len(projects)} projects (>= {self.min_capacity_mw} MW)")
             
         except requests.exceptions.RequestException as e:
             logger.error(f"MISO: Network error: {e}")
         except json.JSONDecodeError as e:
             logger.error(f"MISO: JSON parse error: {e}")
-            logger.error(f"MISO: Response content: {response.text[:500]}")
+            logger.error(f"MISO: Response content: {e.doc[:500]}")
         except Exception as e:
             logger.error(f"MISO: Unexpected error: {e}")
             import traceback
@@ -526,36 +1191,13 @@ class HybridPowerMonitor:
         projects = []
         try:
             logger.info("MISO: Fetching via gridstatus.MISO()")
-            miso = gridstatus.MISO()
-            df = miso.get_interconnection_queue()
+            df = self.gridstatus_queue('MISO')
             logger.info(f"MISO: gridstatus returned {len(df)} rows")
             logger.info(f"MISO: gridstatus columns: {list(df.columns)[:10]}")
             
-            for _, row in df.iterrows():
-                # gridstatus normalizes the column name to 'Capacity (MW)'
-                capacity = self.extract_capacity(row.get('Capacity (MW)') or row.get('summerNetMW') or row.get('winterNetMW') or 0)
-                if capacity:
-                    proj = {
-                        'request_id': f"MISO_{row.get('Queue ID', row.get('jNumber', row.name))}",
-                        'project_name': str(row.get('Project Name', row.get('projectName', 'Unknown')))[:500],
-                        'capacity_mw': capacity,
-                        'county': str(row.get('County', row.get('county', '')))[:200],
-                        'state': str(row.get('State', row.get('state', '')))[:2],
-                        'customer': str(row.get('Interconnecting Entity', row.get('interconnectionEntity', '')))[:500],
-                        'utility': 'MISO',
-                        'status': str(row.get('Status', row.get('status', 'Active'))),
-                        'fuel_type': str(row.get('Fuel Type', row.get('fuelType', ''))),
-                        'source': 'MISO',
-                        'source_url': 'gridstatus',
-                        'project_type': self.classify_project(
-                            row.get('Project Name', row.get('projectName', '')),
-                            row.get('Interconnecting Entity', row.get('interconnectionEntity', '')),
-                            row.get('Fuel Type', row.get('fuelType', ''))
-                        )
-                    }
-                    proj['hunter_score'] = self.calculate_hunter_score(proj)
-                    proj['data_hash'] = self.generate_hash(proj)
-                    projects.append(proj)
+            # gridstatus normalizes the column name to 'Capacity (MW)'
+            capacities = self.extract_capacities(coalesce_columns(df, ['Capacity (MW)', 'summerNetMW', 'winterNetMW']))
+            projects = self.queue_projects(df, capacities, MISO_GRIDSTATUS_FIELDS, 'MISO', 'gridstatus')
             
             logger.info(f"MISO: gridstatus extracted {len(projects)} projects")
             
@@ -576,30 +1218,11 @@ class HybridPowerMonitor:
             return projects
         try:
             logger.info("ERCOT: Fetching via gridstatus.Ercot()")
-            ercot = gridstatus.Ercot()  # Note: lowercase 'e'!
-            df = ercot.get_interconnection_queue()
+            df = self.gridstatus_queue('Ercot')  # Note: lowercase 'e'!
             logger.info(f"ERCOT: Found {len(df)} rows")
             
-            for _, row in df.iterrows():
-                capacity = self.extract_capacity(row.get('Capacity (MW)') or row.get('Summer MW') or 0)
-                if capacity:
-                    data = {
-                        'request_id': f"ERCOT_{row.get('Queue ID', row.name)}",
-                        'project_name': str(row.get('Project Name', 'Unknown'))[:500],
-                        'capacity_mw': capacity,
-                        'county': str(row.get('County', ''))[:200],
-                        'state': 'TX',
-                        'customer': str(row.get('Interconnecting Entity', ''))[:500],
-                        'utility': 'ERCOT',
-                        'status': str(row.get('Status', 'Active')),
-                        'fuel_type': str(row.get('Fuel', row.get('Technology', ''))),
-                        'source': 'ERCOT',
-                        'source_url': 'gridstatus',
-                        'project_type': self.classify_project(str(row.get('Project Name', '')), str(row.get('Interconnecting Entity', '')), str(row.get('Fuel', '')))
-                    }
-                    data['hunter_score'] = self.calculate_hunter_score(data)
-                    data['data_hash'] = self.generate_hash(data)
-                    projects.append(data)
+            capacities = self.extract_capacities(coalesce_columns(df, ['Capacity (MW)', 'Summer MW']))
+            projects = self.queue_projects(df, capacities, ERCOT_FIELDS, 'ERCOT', 'gridstatus', state='TX')
             logger.info(f"ERCOT: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"ERCOT failed: {e}")
@@ -616,9 +1239,10 @@ class HybridPowerMonitor:
         projects = []
         
         # Check cache first
-        if 'PJM' in self.berkeley_lab_cache and self.berkeley_lab_cache['PJM']:
-            logger.info(f"PJM: Using cached data ({len(self.berkeley_lab_cache['PJM'])} projects)")
-            return self.berkeley_lab_cache['PJM']
+        if 'PJM' in self.berkeley_lab_cache:
+            projects = unpack_projects(self.berkeley_lab_cache['PJM'])
+            logger.info(f"PJM: Using cached data ({len(projects)} projects)")
+            return projects
         
         # Fetch from Berkeley Lab
         logger.info("PJM: Fetching from Berkeley Lab dataset")
@@ -628,7 +1252,7 @@ class HybridPowerMonitor:
         pjm_projects = [p for p in berkeley_projects if p.get('utility') == 'PJM']
         
         if pjm_projects:
-            self.berkeley_lab_cache['PJM'] = pjm_projects
+            self.berkeley_lab_cache['PJM'] = pack_projects(pjm_projects)
             logger.info(f"PJM: Extracted {len(pjm_projects)} projects from Berkeley Lab")
         else:
             logger.warning("PJM: No data found in Berkeley Lab dataset")
@@ -654,50 +1278,32 @@ class HybridPowerMonitor:
             'https://emp.lbl.gov/sites/default/files/2024-04/queued_up_2024_data_file.xlsx',
         ]
         
-        # Different header combinations to try
-        header_sets = [
-            {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Referer': 'https://emp.lbl.gov/queues',
-                'Accept': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet,application/vnd.ms-excel,*/*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Origin': 'https://emp.lbl.gov',
-            },
-            {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
-                'Referer': 'https://emp.lbl.gov/queues',
-                'Accept': '*/*',
-            },
-            {
-                'User-Agent': 'curl/7.88.1',
-                'Accept': '*/*',
-            },
-        ]
-        
         df = None
         successful_url = None
-        excel_content = None  # Save for re-reading with correct header
+        excel_path = None  # Save for re-reading with correct header
         selected_sheet = None  # Save sheet name for re-reading
         
-        for url in urls_to_try:
-            for headers in header_sets:
+        for url in self.berkeley_lab_urls(urls_to_try, headers=BERKELEY_LAB_HEADER_SETS[0]):
+            for headers in BERKELEY_LAB_HEADER_SETS:
                 try:
                     logger.info(f"Berkeley Lab: Trying {url}")
-                    response = self.session.get(url, headers=headers, timeout=120, allow_redirects=True)
+                    # Streamed to disk: the workbook is never held in memory as bytes
+                    path, _ = self.conditional_download(url, headers=headers, timeout=120, allow_redirects=True)
                     
                     # Check if we got actual Excel data
-                    if response.status_code == 200:
-                        content_type = response.headers.get('Content-Type', '')
-                        content_length = len(response.content)
+                    if path is not None:
+                        content_length = os.path.getsize(path)
+                        with open(path, 'rb') as f:
+                            magic = f.read(4)
                         
-                        # Excel files should be > 100KB and have right content type or magic bytes
+                        # Excel files should be > 100KB and have Excel magic bytes
                         if content_length > 100000:
-                            # Check for Excel magic bytes (PK for xlsx)
-                            if response.content[:2] == b'PK' or 'spreadsheet' in content_type or 'excel' in content_type:
+                            # PK for xlsx, OLE2 for legacy xls
+                            if magic[:2] == b'PK' or magic == b'\xd0\xcf\x11\xe0':
                                 logger.info(f"Berkeley Lab: Downloaded {content_length/1024/1024:.1f} MB from {url}")
                                 
                                 # Try to find the correct sheet with project data
-                                excel_file = pd.ExcelFile(BytesIO(response.content))
+                                excel_file = pd.ExcelFile(path, engine=EXCEL_ENGINE)
                                 logger.info(f"Berkeley Lab: Found {len(excel_file.sheet_names)} sheets: {excel_file.sheet_names}")
                                 
                                 # Look for the data sheet by name first - be specific!
@@ -797,17 +1403,19 @@ class HybridPowerMonitor:
                                         logger.info(f"Berkeley Lab: Using sheet index 0 ('{data_sheet}') with {len(df)} rows")
                                 
                                 successful_url = url
-                                excel_content = response.content  # Save for re-reading
+                                excel_path = path  # Save for re-reading
                                 selected_sheet = data_sheet  # Save sheet name
                                 logger.info(f"Berkeley Lab: SUCCESS! Final sheet has {len(df)} rows")
                                 break
                             else:
-                                logger.debug(f"Berkeley Lab: Got response but not Excel (type: {content_type}, size: {content_length})")
+                                logger.debug(f"Berkeley Lab: Got response but not Excel (magic: {magic!r}, size: {content_length})")
                         else:
                             logger.debug(f"Berkeley Lab: Response too small ({content_length} bytes)")
-                    else:
-                        logger.debug(f"Berkeley Lab: HTTP {response.status_code} for {url}")
                         
+                except requests.exceptions.ConnectionError as e:
+                    # Other headers will not help if the host cannot be reached
+                    logger.debug(f"Berkeley Lab: Cannot reach {url}: {e}")
+                    break
                 except Exception as e:
                     logger.debug(f"Berkeley Lab: Failed {url}: {e}")
                     continue
@@ -815,6 +1423,9 @@ class HybridPowerMonitor:
             if df is not None:
                 break
         
+        if successful_url:
+            db.set_setting('berkeley_lab_url', successful_url)
+        
         # Strategy 2: Check for locally cached file
         if df is None:
             local_paths = [
@@ -826,7 +1437,7 @@ class HybridPowerMonitor:
             for path in local_paths:
                 if os.path.exists(path):
                     try:
-                        df = pd.read_excel(path, sheet_name=0)
+                        df = pd.read_excel(path, sheet_name=0, engine=EXCEL_ENGINE)
                         successful_url = f"file://{path}"
                         logger.info(f"Berkeley Lab: Loaded from local cache: {path}")
                         break
@@ -860,13 +1471,13 @@ class HybridPowerMonitor:
             logger.info(f"Berkeley Lab: Actual Excel header row is {actual_header_row}")
             
             # Re-read with correct header row
-            if excel_content is not None:
-                # Re-read from the saved content
-                excel_file = pd.ExcelFile(BytesIO(excel_content))
+            if excel_path is not None:
+                # Re-read from the downloaded file
+                excel_file = pd.ExcelFile(excel_path, engine=EXCEL_ENGINE)
                 df = pd.read_excel(excel_file, sheet_name=selected_sheet, header=actual_header_row)
             elif successful_url and not successful_url.startswith('http'):
                 # Local file
-                df = pd.read_excel(successful_url.replace('file://', ''), header=actual_header_row)
+                df = pd.read_excel(successful_url.replace('file://', ''), header=actual_header_row, engine=EXCEL_ENGINE)
             logger.info(f"Berkeley Lab: Re-read with header at Excel row {actual_header_row}, now {len(df)} rows")
         
         # Clean column names (remove whitespace, normalize)
@@ -877,80 +1488,54 @@ class HybridPowerMonitor:
         logger.info(f"Berkeley Lab: Columns: {list(df.columns)[:10]}")
         
         # Find columns
-        def find_col(names):
-            for name in names:
-                for col in df.columns:
-                    if name.lower() in str(col).lower():
-                        return col
-            return None
-        
-        entity_col = find_col(['entity', 'region', 'iso', 'rto', 'ba'])
-        mw_col = find_col(['capacity_mw', 'mw', 'capacity', 'nameplate'])
-        name_col = find_col(['project_name', 'project', 'name'])
-        id_col = find_col(['queue_id', 'request_id', 'queue_pos', 'position'])
-        state_col = find_col(['state'])
-        county_col = find_col(['county'])
-        status_col = find_col(['queue_status', 'status'])
-        fuel_col = find_col(['resource_type', 'resource', 'fuel', 'type', 'technology'])
-        developer_col = find_col(['developer', 'interconnection', 'owner', 'applicant'])
+        cols = resolve_columns(df.columns, BERKELEY_LAB_COLUMNS)
+        entity_col = cols['entity']
         
-        for idx, row in df.iterrows():
+        capacities = self.first_capacity(df, [cols['mw']])
+        df, capacities = df[capacities.notna()], capacities.dropna()
+        utilities = self.map_entities(df[entity_col] if entity_col else pd.Series('', index=df.index))
+        fields = field_columns(df, {
+            'id': ([cols['id']], None),
+            'name': ([cols['name']], 'Unknown'),
+            'county': ([cols['county']], ''),
+            'state': ([cols['state']], ''),
+            'customer': ([cols['developer']], ''),
+            'status': ([cols['status']], 'Active'),
+            'fuel': ([cols['fuel']], ''),
+        })
+        skipped = 0
+        for queue_id, name, county, state, customer, status, fuel, capacity, utility in zip(
+                *fields, capacities.tolist(), utilities.tolist()):
             try:
-                entity = str(row.get(entity_col, '') if entity_col else '').upper()
-                
-                # Map entity to utility name
-                if 'PJM' in entity:
-                    utility = 'PJM'
-                elif 'MISO' in entity:
-                    utility = 'MISO'
-                elif 'CAISO' in entity or 'CALIFORNIA' in entity:
-                    utility = 'CAISO'
-                elif 'ERCOT' in entity or 'TEXAS' in entity:
-                    utility = 'ERCOT'
-                elif 'SPP' in entity:
-                    utility = 'SPP'
-                elif 'NYISO' in entity or 'NEW YORK' in entity:
-                    utility = 'NYISO'
-                elif 'ISO-NE' in entity or 'ISONE' in entity or 'NEW ENGLAND' in entity:
-                    utility = 'ISO-NE'
-                else:
-                    utility = entity[:20] if entity else 'Other'
-                
-                capacity = self.extract_capacity(row.get(mw_col, 0) if mw_col else 0)
-                if not capacity:
-                    continue
-                
                 proj = {
-                    'request_id': f"{utility}_BL_{row.get(id_col, idx) if id_col else idx}",
-                    'project_name': str(row.get(name_col, 'Unknown') if name_col else 'Unknown')[:500],
+                    'request_id': f"{utility}_BL_{queue_id}",
+                    'project_name': name[:500],
                     'capacity_mw': capacity,
-                    'county': str(row.get(county_col, '') if county_col else '')[:200],
-                    'state': str(row.get(state_col, '') if state_col else '')[:2],
-                    'customer': str(row.get(developer_col, '') if developer_col else '')[:500],
+                    'county': county[:200],
+                    'state': state[:2],
+                    'customer': customer[:500],
                     'utility': utility,
-                    'status': str(row.get(status_col, 'Active') if status_col else 'Active'),
-                    'fuel_type': str(row.get(fuel_col, '') if fuel_col else ''),
+                    'status': status,
+                    'fuel_type': fuel,
                     'source': f'{utility} (Berkeley Lab)',
                     'source_url': successful_url,
-                    'project_type': self.classify_project(
-                        str(row.get(name_col, '') if name_col else ''),
-                        str(row.get(developer_col, '') if developer_col else ''),
-                        str(row.get(fuel_col, '') if fuel_col else '')
-                    )
                 }
-                proj['hunter_score'] = self.calculate_hunter_score(proj)
                 proj['data_hash'] = self.generate_hash(proj)
                 projects.append(proj)
                 
-            except Exception as e:
+            except (KeyError, ValueError, TypeError) as e:
+                skipped += 1
+                logger.debug(f"Berkeley Lab: Bad row {queue_id}: {e}")
                 continue
+        if skipped:
+            logger.warning(f"Berkeley Lab: Skipped {skipped} malformed rows")
         
         # Cache by utility
+        by_utility = {}
         for proj in projects:
-            utility = proj.get('utility', 'Other')
-            if utility not in self.berkeley_lab_cache:
-                self.berkeley_lab_cache[utility] = []
-            self.berkeley_lab_cache[utility].append(proj)
+            by_utility.setdefault(proj.get('utility', 'Other'), []).append(proj)
+        for utility, utility_projects in by_utility.items():
+            self.berkeley_lab_cache[utility] = pack_projects(utility_projects)
         
         logger.info(f"Berkeley Lab: Extracted {len(projects)} total projects")
         
@@ -963,9 +1548,45 @@ class HybridPowerMonitor:
         
         return projects
 
+    def normalize_text_columns(self, df):
+        """Tidy scraped text in place, one vectorized pass per column.
+
+        Strips whitespace, blanks the 'nan'/'None' strings left by str() on
+        missing cells, and drops a trailing "County" so the same county from
+        different sources groups together.
+        """
+        for col in ('project_name', 'county', 'state', 'customer', 'status', 'fuel_type'):
+            text = df[col].astype(str).str.strip()
+            df[col] = text.mask(text.isin(MISSING_TEXT), '')
+        df['county'] = df['county'].str.replace(COUNTY_SUFFIX_RE, '', regex=True)
+
     # =========================================================================
     # Main Run
     # =========================================================================
+    # projects columns written by a scan, in upsert parameter order
+    STORED_COLUMNS = [
+        'request_id', 'project_name', 'capacity_mw', 'county', 'state', 'customer',
+        'utility', 'status', 'fuel_type', 'source', 'source_url', 'project_type',
+        'hunter_score', 'data_hash',
+    ]
+
+    # One constant statement text, so each sync's executemany reuses the
+    # compiled statement from the connection's cache
+    UPSERT_SQL = '''
+        INSERT INTO projects (request_id, project_name, capacity_mw, county, state,
+            customer, utility, status, fuel_type, source, source_url, project_type,
+            hunter_score, data_hash, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(request_id) DO UPDATE SET
+            project_name=excluded.project_name, capacity_mw=excluded.capacity_mw,
+            county=excluded.county, state=excluded.state, customer=excluded.customer,
+            utility=excluded.utility, status=excluded.status, fuel_type=excluded.fuel_type,
+            source=excluded.source, source_url=excluded.source_url,
+            project_type=excluded.project_type, hunter_score=excluded.hunter_score,
+            data_hash=excluded.data_hash, content_hash=excluded.content_hash,
+            last_updated=CURRENT_TIMESTAMP
+    '''
+
     def run_comprehensive_monitoring(self):
         """Run all monitors and store results"""
         start_time = time.time()
@@ -982,71 +1603,91 @@ class HybridPowerMonitor:
         
         all_projects = []
         stats = {}
+        sync_logs = []  # written in the same transaction as the projects
+        source_ids = {}
         
-        for source_name, fetch_func in monitors:
-            try:
+        # The fetchers spend most of their time waiting on downloads, so run them
+        # side by side; results are still collected in the order above
+        with ThreadPoolExecutor(max_workers=len(monitors)) as pool:
+            futures = []
+            for source_name, fetch_func in monitors:
                 logger.info(f"Fetching {source_name}...")
-                projects = fetch_func()
+                futures.append((source_name, pool.submit(fetch_func)))
+        
+        for source_name, future in futures:
+            try:
+                projects = future.result()
                 all_projects.extend(projects)
                 stats[source_name] = len(projects)
+                source_ids[source_name] = [p['request_id'] for p in projects]
                 logger.info(f"{source_name}: {len(projects)} projects")
-                
-                db.execute('''
-                    INSERT INTO sync_log (source, projects_found, projects_new, status)
-                    VALUES (?, ?, 0, 'success')
-                ''', (source_name, len(projects)))
+                sync_logs.append((source_name, len(projects), 'success', None))
                 
             except Exception as e:
                 logger.error(f"{source_name} failed: {e}")
                 stats[source_name] = 0
-                db.execute('''
-                    INSERT INTO sync_log (source, projects_found, projects_new, status, error_message)
-                    VALUES (?, 0, 0, 'error', ?)
-                ''', (source_name, str(e)))
-        
-        # Store projects
-        new_count = 0
-        for project in all_projects:
+                sync_logs.append((source_name, 0, 'error', str(e)))
+
+        # Score every project in one vectorized pass and build the upsert rows
+        # straight from the frame, without writing scores back into each dict
+        rows = []
+        if all_projects:
+            df = pd.DataFrame(all_projects).reindex(columns=self.STORED_COLUMNS)
+            optional = [c for c in self.STORED_COLUMNS if c not in ('capacity_mw', 'hunter_score')]
+            df[optional] = df[optional].fillna('')
+            self.normalize_text_columns(df)
+            df['project_type'] = self.classify_projects(df)
+            df['hunter_score'] = self.calculate_hunter_scores(df)
+            rows = [row + (content_hash(row),) for row in df.itertuples(index=False, name=None)]
+
+        # Load the known request_ids and content hashes once: they count new
+        # projects per source, and let unchanged projects skip the write entirely
+        known = {row['request_id']: row['content_hash']
+                 for row in db.fetchall('SELECT request_id, content_hash FROM projects')}
+        new_by_source = {}
+        seen = set(known)
+        for source_name, request_ids in source_ids.items():
+            fresh = set(request_ids) - seen
+            seen |= fresh
+            new_by_source[source_name] = len(fresh)
+        new_count = sum(new_by_source.values())
+        # Later duplicates of a request_id win, as they did with every row upserted
+        latest = {row[0]: row for row in rows}
+        changed = [row for request_id, row in latest.items() if known.get(request_id) != row[-1]]
+        logger.info(f"{len(changed)} of {len(latest)} projects new or changed")
+        sync_rows = [(source_name, found, new_by_source.get(source_name, 0), status, error)
+                     for source_name, found, status, error in sync_logs]
+
+        # Store projects - one upsert on the request_id unique index instead of
+        # a SELECT + UPDATE/INSERT round trip per project. The projects, sync
+        # log and run record go out in one transaction and one commit; a
+        # SAVEPOINT lets a failed store roll back on its own while the run is
+        # still logged
+        with db.transaction() as conn:
+            conn.execute('BEGIN')
+            conn.execute('SAVEPOINT store_projects')
             try:
-                existing = db.fetchone('SELECT id FROM projects WHERE request_id = ?', (project['request_id'],))
-                if existing:
-                    db.execute('''
-                        UPDATE projects SET
-                            project_name=?, capacity_mw=?, county=?, state=?, customer=?,
-                            utility=?, status=?, fuel_type=?, source=?, source_url=?,
-                            project_type=?, hunter_score=?, data_hash=?, last_updated=CURRENT_TIMESTAMP
-                        WHERE request_id=?
-                    ''', (
-                        project['project_name'], project['capacity_mw'], project.get('county', ''),
-                        project.get('state', ''), project.get('customer', ''), project['utility'],
-                        project.get('status', ''), project.get('fuel_type', ''), project['source'],
-                        project.get('source_url', ''), project.get('project_type', ''),
-                        project.get('hunter_score', 0), project['data_hash'], project['request_id']
-                    ))
-                else:
-                    db.execute('''
-                        INSERT INTO projects (request_id, project_name, capacity_mw, county, state,
-                            customer, utility, status, fuel_type, source, source_url, project_type,
-                            hunter_score, data_hash)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        project['request_id'], project['project_name'], project['capacity_mw'],
-                        project.get('county', ''), project.get('state', ''), project.get('customer', ''),
-                        project['utility'], project.get('status', ''), project.get('fuel_type', ''),
-                        project['source'], project.get('source_url', ''), project.get('project_type', ''),
-                        project.get('hunter_score', 0), project['data_hash']
-                    ))
-                    new_count += 1
-            except Exception as e:
-                logger.debug(f"Failed to store project: {e}")
-        
-        duration = time.time() - start_time
-        
-        # Log run
-        db.execute('''
-            INSERT INTO monitor_runs (status, sources_checked, projects_found, projects_stored, duration_seconds, details)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', ('success', len(monitors), len(all_projects), new_count, duration, json.dumps(stats)))
+                conn.executemany(self.UPSERT_SQL, changed)
+                conn.executemany('''
+                    INSERT INTO sync_log (source, projects_found, projects_new, status, error_message)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', sync_rows)
+                if changed:
+                    # Refresh the planner's statistics for the new table contents
+                    conn.execute('ANALYZE projects')
+            except sqlite3.Error as e:
+                logger.error(f"Failed to store projects: {e}")
+                conn.execute('ROLLBACK TO store_projects')
+                new_count = 0
+            conn.execute('RELEASE store_projects')
+            
+            duration = time.time() - start_time
+            
+            # Log run
+            conn.execute('''
+                INSERT INTO monitor_runs (status, sources_checked, projects_found, projects_stored, duration_seconds, details)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', ('success', len(monitors), len(all_projects), new_count, duration, json.dumps(stats)))
         
         logger.info(f"Monitoring complete: {len(all_projects)} projects, {new_count} new, {duration:.1f}s")
         
@@ -1061,16 +1702,190 @@ class HybridPowerMonitor:
 # Initialize monitor
 monitor = HybridPowerMonitor(min_capacity_mw=100)
 
+# Manual and API syncs run in a separate scan process: requests return at
+# once, and the pandas parsing does not compete with the web threads for the
+# GIL. Jobs are rows in scan_jobs, so every gunicorn worker and the scheduler
+# see the same queue and at most one scan is pending across all of them.
+def init_scan_worker():
+    """Set up the scan process.
+
+    spawn starts it from a fresh import of this module, so it builds its own
+    SQLite connections, HTTP session and monitor instead of inheriting the
+    web process's. Stopping is left to the process that owns it: a scan in
+    progress ignores SIGTERM and runs until it finishes or is killed.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+def create_scan_executor():
+    # spawn, not fork: forking the threaded web server can copy a lock held by
+    # another thread into the child and deadlock it
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=init_scan_worker)
+
+
+scan_executor = create_scan_executor()
+MAX_SCAN_JOBS = 20
+# A job still queued or running after this long belongs to a process that
+# died mid-scan, and no longer blocks new ones
+SCAN_STALE_SECONDS = 3 * 3600
+
+
+def start_scan():
+    """Queue a monitoring run; (job_id, True) if queued, else (pending job_id, False)"""
+    global scan_executor
+    with db.transaction() as conn:
+        # Takes the write lock up front, so two processes cannot both find no
+        # pending job and queue one each
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('''
+            UPDATE scan_jobs SET status = 'failed', finished_at = CURRENT_TIMESTAMP,
+                                 error = 'Abandoned: the process running it stopped'
+            WHERE status IN ('queued', 'running')
+              AND COALESCE(started_at, created_at) < datetime('now', ?)
+        ''', (f'-{SCAN_STALE_SECONDS} seconds',))
+        pending = conn.execute(
+            "SELECT id FROM scan_jobs WHERE status IN ('queued', 'running')").fetchone()
+        if pending:
+            return pending['id'], False
+        job_id = uuid.uuid4().hex
+        conn.execute("INSERT INTO scan_jobs (id, status) VALUES (?, 'queued')", (job_id,))
+        # Forget the oldest finished jobs
+        conn.execute('''
+            DELETE FROM scan_jobs WHERE id NOT IN (
+                SELECT id FROM scan_jobs ORDER BY created_at DESC, rowid DESC LIMIT ?)
+        ''', (MAX_SCAN_JOBS,))
+    try:
+        future = scan_executor.submit(run_scan_job, job_id)
+    except BrokenProcessPool:
+        logger.warning("Scan process died, starting a new one")
+        scan_executor = create_scan_executor()
+        future = scan_executor.submit(run_scan_job, job_id)
+    future.add_done_callback(lambda f: scan_job_done(job_id, f))
+    return job_id, True
+
+
+def scan_job_done(job_id, future):
+    """Fail a job whose scan process died before it could record an outcome"""
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Sync {job_id} lost its scan process: {error}")
+        db.execute('''
+            UPDATE scan_jobs SET status = 'failed', finished_at = CURRENT_TIMESTAMP, error = ?
+            WHERE id = ? AND status IN ('queued', 'running')
+        ''', (str(error) or type(error).__name__, job_id))
+
+
+def run_scan_job(job_id):
+    """Run a queued scan, recording its progress and outcome in scan_jobs"""
+    db.execute("UPDATE scan_jobs SET status = 'running', started_at = CURRENT_TIMESTAMP WHERE id = ?",
+               (job_id,))
+    try:
+        result = monitor.run_comprehensive_monitoring()
+    except Exception as e:
+        logger.error(f"Sync {job_id} failed: {e}")
+        db.execute('''
+            UPDATE scan_jobs SET status = 'failed', finished_at = CURRENT_TIMESTAMP, error = ?
+            WHERE id = ?
+        ''', (str(e), job_id))
+        return
+    db.execute('''
+        UPDATE scan_jobs SET status = 'finished', finished_at = CURRENT_TIMESTAMP, result = ?
+        WHERE id = ?
+    ''', (json.dumps(result), job_id))
+
 
 # =============================================================================
 # Flask Routes
 # =============================================================================
 
-@app.route('/')
-def index():
-    """Dashboard home"""
-    total = db.fetchone('SELECT COUNT(*) as count FROM projects')['count']
-    total_mw = db.fetchone('SELECT SUM(capacity_mw) as total FROM projects')['total'] or 0
+# Keyset pagination over ORDER BY hunter_score DESC, capacity_mw DESC, id: a
+# page resumes after the previous page's last (score, mw, id) so deep pages
+# are an index range scan, not an OFFSET skip
+KEYSET_CLAUSE = '''hunter_score <= ?
+    AND (hunter_score < ? OR capacity_mw < ? OR (capacity_mw = ? AND id > ?))'''
+
+
+def cursor_for(row):
+    return f"{row['hunter_score']},{row['capacity_mw']},{row['id']}"
+
+
+def parse_cursor(value):
+    """(score, mw, id) from an "after" cursor, or None if absent or malformed"""
+    try:
+        after_score, after_mw, after_id = value.split(',')
+        return int(after_score), float(after_mw), int(after_id)
+    except ValueError:
+        return None
+
+
+def keyset_params(after):
+    score, mw, row_id = after
+    return [score, score, mw, mw, row_id]
+
+
+class Pagination:
+    """The subset of Flask-SQLAlchemy's Pagination the templates use"""
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.pages = (total + per_page - 1) // per_page
+        self.has_prev = page > 1
+        self.has_next = page < self.pages
+        self.prev_num = page - 1
+        self.next_num = page + 1
+        # Keyset cursor for the page after this one
+        self.next_cursor = None
+        if items:
+            self.next_cursor = cursor_for(items[-1])
+
+
+def scan_epoch():
+    """Id of the latest monitor run, the cache key for per-scan aggregates"""
+    return db.fetchone('SELECT MAX(id) as id FROM monitor_runs')['id'] or 0
+
+
+@lru_cache(maxsize=64)
+def count_projects(scan_epoch, where_clause, params):
+    """Projects matching a /projects filter as of scan_epoch.
+
+    Paging through one filter reuses its count instead of recounting the
+    filtered set on every page.
+    """
+    return db.fetchone(f'SELECT COUNT(*) as count FROM projects WHERE {where_clause}', params)['count']
+
+
+@lru_cache(maxsize=1)
+def project_states(scan_epoch):
+    """States with projects as of scan_epoch, for the /projects filter"""
+    return [r['state'] for r in db.fetchall('SELECT DISTINCT state FROM projects WHERE state != "" ORDER BY state')]
+
+
+@lru_cache(maxsize=1)
+def source_stats(scan_epoch):
+    """Per-source last sync and totals as of scan_epoch; sync_log is only
+    written by a scan, in the same commit as its monitor run"""
+    return [dict(row) for row in db.fetchall('''
+        SELECT source, MAX(sync_time) as last_sync, SUM(projects_found) as total_found
+        FROM sync_log GROUP BY source
+    ''')]
+
+
+@lru_cache(maxsize=1)
+def dashboard_stats(scan_epoch):
+    """Dashboard aggregates as of scan_epoch, the id of the latest monitor run.
+
+    Projects are only written by a scan, which records its monitor run in the
+    same commit, so these are recomputed once per scan instead of per visit.
+    """
+    # Headline numbers in one table scan instead of three
+    totals = db.fetchone('''
+        SELECT COUNT(*) as count, SUM(capacity_mw) as total_mw,
+               SUM(CASE WHEN hunter_score >= 60 THEN 1 ELSE 0 END) as high_score
+        FROM projects
+    ''')
     
     by_utility = db.fetchall('''
         SELECT utility, COUNT(*) as count, SUM(capacity_mw) as total_mw
@@ -1082,22 +1897,32 @@ def index():
         FROM projects GROUP BY project_type ORDER BY count DESC
     ''')
     
-    high_score = db.fetchone('SELECT COUNT(*) as count FROM projects WHERE hunter_score >= 60')['count']
     recent = db.fetchall('''
-        SELECT * FROM projects ORDER BY first_seen DESC LIMIT 10
+        SELECT id, project_name, state, capacity_mw, utility, hunter_score
+        FROM projects ORDER BY first_seen DESC LIMIT 10
     ''')
     
-    last_run = db.fetchone('SELECT * FROM monitor_runs ORDER BY run_date DESC LIMIT 1')
+    return {
+        'total': totals['count'],
+        'total_mw': totals['total_mw'] or 0,
+        'high_score': totals['high_score'] or 0,
+        'by_utility': [dict(row) for row in by_utility],
+        'by_type': [dict(row) for row in by_type],
+        'recent': [dict(row) for row in recent],
+    }
+
+
+@app.route('/')
+def index():
+    """Dashboard home"""
+    # Only what the page shows, not the run's details JSON
+    last_run = db.fetchone('SELECT id, run_date, projects_found FROM monitor_runs ORDER BY run_date DESC LIMIT 1')
+    stats = dashboard_stats(last_run['id'] if last_run else 0)
     
     return render_template('index.html',
-        total=total,
-        total_mw=total_mw,
-        by_utility=by_utility,
-        by_type=by_type,
-        high_score=high_score,
-        recent=recent,
         last_run=last_run,
-        gridstatus_available=GRIDSTATUS_AVAILABLE
+        gridstatus_available=GRIDSTATUS_AVAILABLE,
+        **stats
     )
 
 
@@ -1131,38 +1956,38 @@ def projects():
         params.append(min_capacity)
     
     if search:
-        conditions.append('(project_name LIKE ? OR customer LIKE ? OR county LIKE ?)')
-        params.extend([f'%{search}%'] * 3)
+        # The trigram index finds substrings of 3+ characters without scanning
+        # the table; shorter terms, or ones using LIKE wildcards, still use LIKE
+        if db.search_index and len(search) >= 3 and not any(c in search for c in '%_'):
+            conditions.append('id IN (SELECT rowid FROM projects_search WHERE projects_search MATCH ?)')
+            params.append('"' + search.replace('"', '""') + '"')
+        else:
+            conditions.append('(project_name LIKE ? OR customer LIKE ? OR county LIKE ?)')
+            params.extend([f'%{search}%'] * 3)
     
     where_clause = ' AND '.join(conditions) if conditions else '1=1'
     
     # Get total count
-    total = db.fetchone(f'SELECT COUNT(*) as count FROM projects WHERE {where_clause}', params)['count']
+    total = count_projects(scan_epoch(), where_clause, tuple(params))
     
-    # Get paginated results
-    offset = (page - 1) * per_page
-    query_params = params + [per_page, offset]
+    # Get paginated results; "Next" links carry a keyset cursor
+    after = parse_cursor(request.args.get('after', ''))
+    if after:
+        page_clause = f'{where_clause} AND {KEYSET_CLAUSE}'
+        query_params = params + keyset_params(after) + [per_page, 0]
+    else:
+        page_clause = where_clause
+        query_params = params + [per_page, (page - 1) * per_page]
     items = db.fetchall(f'''
-        SELECT * FROM projects WHERE {where_clause}
-        ORDER BY hunter_score DESC, capacity_mw DESC
+        SELECT id, request_id, project_name, capacity_mw, county, state, customer,
+               utility, status, fuel_type, project_type, hunter_score
+        FROM projects WHERE {page_clause}
+        ORDER BY hunter_score DESC, capacity_mw DESC, id
         LIMIT ? OFFSET ?
     ''', query_params)
     
     # Get states for filter
-    states = [r['state'] for r in db.fetchall('SELECT DISTINCT state FROM projects WHERE state != "" ORDER BY state')]
-    
-    # Create pagination object
-    class Pagination:
-        def __init__(self, items, page, per_page, total):
-            self.items = items
-            self.page = page
-            self.per_page = per_page
-            self.total = total
-            self.pages = (total + per_page - 1) // per_page
-            self.has_prev = page > 1
-            self.has_next = page < self.pages
-            self.prev_num = page - 1
-            self.next_num = page + 1
+    states = project_states(scan_epoch())
     
     pagination = Pagination(items, page, per_page, total)
     
@@ -1179,21 +2004,31 @@ def projects():
 @app.route('/project/<int:id>')
 def project_detail(id):
     """Single project detail"""
-    project = db.fetchone('SELECT * FROM projects WHERE id = ?', (id,))
+    project = db.fetchone('''
+        SELECT id, request_id, project_name, capacity_mw, county, state, customer, utility,
+               status, fuel_type, source, project_type, hunter_score, first_seen, last_updated
+        FROM projects WHERE id = ?
+    ''', (id,))
     if not project:
         return redirect(url_for('projects'))
     return render_template('project_detail.html', project=project)
 
 
-@app.route('/analytics')
-def analytics():
-    """Analytics dashboard"""
-    # Score distribution
-    high = db.fetchone('SELECT COUNT(*) as count FROM projects WHERE hunter_score >= 70')['count']
-    medium = db.fetchone('SELECT COUNT(*) as count FROM projects WHERE hunter_score >= 40 AND hunter_score < 70')['count']
-    low = db.fetchone('SELECT COUNT(*) as count FROM projects WHERE hunter_score < 40')['count']
+@lru_cache(maxsize=1)
+def analytics_stats(scan_epoch, today):
+    """/analytics aggregates as of scan_epoch, cached like dashboard_stats.
+
+    today is part of the key because the timeline window moves with the date.
+    """
+    # Score distribution in one scan of the score index instead of three counts
+    bands = db.fetchone('''
+        SELECT SUM(CASE WHEN hunter_score >= 70 THEN 1 ELSE 0 END) as high,
+               SUM(CASE WHEN hunter_score >= 40 AND hunter_score < 70 THEN 1 ELSE 0 END) as medium,
+               SUM(CASE WHEN hunter_score < 40 THEN 1 ELSE 0 END) as low
+        FROM projects
+    ''')
     
-    score_distribution = {'high': high, 'medium': medium, 'low': low}
+    score_distribution = {band: bands[band] or 0 for band in ('high', 'medium', 'low')}
     
     # State stats
     state_stats = db.fetchall('''
@@ -1215,30 +2050,38 @@ def analytics():
         GROUP BY DATE(first_seen) ORDER BY date
     ''')
     
-    return render_template('analytics.html',
-        score_distribution=score_distribution,
-        state_stats=state_stats,
-        hotspot_stats=hotspot_stats,
-        timeline=timeline
-    )
+    return {
+        'score_distribution': score_distribution,
+        'state_stats': [dict(row) for row in state_stats],
+        'hotspot_stats': [dict(row) for row in hotspot_stats],
+        'timeline': [dict(row) for row in timeline],
+    }
+
+
+@app.route('/analytics')
+def analytics():
+    """Analytics dashboard"""
+    # DATE('now') is UTC, as is the timeline's window
+    stats = analytics_stats(scan_epoch(), datetime.utcnow().date())
+    
+    return render_template('analytics.html', **stats)
 
 
 @app.route('/monitoring')
 def monitoring():
     """System monitoring page"""
-    runs = db.fetchall('SELECT * FROM monitor_runs ORDER BY run_date DESC LIMIT 20')
-    source_stats = db.fetchall('''
-        SELECT source, MAX(sync_time) as last_sync, SUM(projects_found) as total_found
-        FROM sync_log GROUP BY source
+    runs = db.fetchall('''
+        SELECT run_date, status, sources_checked, projects_found, projects_stored, duration_seconds
+        FROM monitor_runs ORDER BY run_date DESC LIMIT 20
     ''')
     
-    return render_template('monitoring.html', runs=runs, source_stats=source_stats)
+    return render_template('monitoring.html', runs=runs, source_stats=source_stats(scan_epoch()))
 
 
 @app.route('/alerts', methods=['GET', 'POST'])
 def alerts():
     """Alert subscriptions"""
-    subscriptions = db.fetchall('SELECT * FROM alert_subscriptions WHERE active = 1')
+    subscriptions = db.fetchall('SELECT email, min_capacity, states FROM alert_subscriptions WHERE active = 1')
     return render_template('alerts.html', subscriptions=subscriptions)
 
 
@@ -1262,46 +2105,63 @@ def subscribe_alerts():
 
 @app.route('/trigger')
 def trigger_monitor():
-    """Trigger manual sync"""
-    result = monitor.run_comprehensive_monitoring()
+    """Trigger manual sync in the background"""
+    job_id, created = start_scan()
+    if created:
+        logger.info(f"Manual sync queued as job {job_id}")
+    else:
+        logger.info(f"Sync {job_id} already pending")
     return redirect(url_for('monitoring'))
 
 
+@app.route('/trigger/<job_id>')
+@app.route('/api/sync/<job_id>')
+def trigger_status(job_id):
+    """Status of a queued manual or API sync"""
+    job = db.fetchone('SELECT status, result, error FROM scan_jobs WHERE id = ?', (job_id,))
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['status'] == 'failed':
+        return jsonify({'job_id': job_id, 'status': 'failed', 'error': job['error']})
+    if job['status'] == 'finished':
+        return jsonify({'job_id': job_id, 'status': 'finished', 'result': json_loads(job['result'])})
+    return jsonify({'job_id': job_id, 'status': job['status']})
+
+
+# Rows per chunk of a streamed CSV export
+EXPORT_BLOCK_ROWS = 1000
+
+
 @app.route('/export')
 def export_csv():
     """Export projects to CSV"""
     min_score = request.args.get('min_score', 0, type=int)
     
-    projects = db.fetchall('''
+    projects = db.iterate('''
         SELECT request_id, project_name, capacity_mw, county, state, customer,
                utility, status, fuel_type, project_type, hunter_score, first_seen
         FROM projects WHERE hunter_score >= ?
         ORDER BY hunter_score DESC, capacity_mw DESC
     ''', (min_score,))
     
-    # Build CSV
-    lines = ['Request ID,Project Name,Capacity MW,County,State,Customer,Utility,Status,Fuel Type,Type,Score,First Seen']
-    for p in projects:
-        line = ','.join([
-            f'"{p["request_id"]}"',
-            f'"{(p["project_name"] or "").replace(chr(34), chr(39))}"',
-            str(p['capacity_mw']),
-            f'"{p["county"] or ""}"',
-            f'"{p["state"] or ""}"',
-            f'"{(p["customer"] or "").replace(chr(34), chr(39))}"',
-            f'"{p["utility"]}"',
-            f'"{p["status"] or ""}"',
-            f'"{p["fuel_type"] or ""}"',
-            f'"{p["project_type"] or ""}"',
-            str(p['hunter_score']),
-            f'"{p["first_seen"]}"'
-        ])
-        lines.append(line)
-    
-    csv_content = '\n'.join(lines)
+    # Stream the CSV a block of rows at a time, so neither the result set nor
+    # the whole file is ever held in memory. csv.writer formats each block in
+    # C: text quoted with embedded quotes doubled, numbers bare, NULLs as "".
+    def generate():
+        yield 'Request ID,Project Name,Capacity MW,County,State,Customer,Utility,Status,Fuel Type,Type,Score,First Seen\n'
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator='\n')
+        while True:
+            rows = projects.fetchmany(EXPORT_BLOCK_ROWS)
+            if not rows:
+                break
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
     
     return Response(
-        csv_content,
+        generate(),
         mimetype='text/csv',
         headers={'Content-Disposition': f'attachment; filename=power_projects_{datetime.now().strftime("%Y%m%d")}.csv'}
     )
@@ -1311,9 +2171,9 @@ def export_csv():
 # API Routes
 # =============================================================================
 
-@app.route('/api/stats')
-def api_stats():
-    """API: Get statistics"""
+@lru_cache(maxsize=1)
+def api_stats_data(scan_epoch):
+    """/api/stats aggregates as of scan_epoch, cached like dashboard_stats"""
     total = db.fetchone('SELECT COUNT(*) as count FROM projects')['count']
     by_utility = [dict(r) for r in db.fetchall('''
         SELECT utility, COUNT(*) as count, SUM(capacity_mw) as total_mw
@@ -1322,13 +2182,13 @@ def api_stats():
     by_state = [dict(r) for r in db.fetchall('''
         SELECT state, COUNT(*) as count FROM projects WHERE state != '' GROUP BY state
     ''')]
-    
-    return jsonify({
-        'total_projects': total,
-        'by_utility': by_utility,
-        'by_state': by_state,
-        'gridstatus_available': GRIDSTATUS_AVAILABLE
-    })
+    return {'total_projects': total, 'by_utility': by_utility, 'by_state': by_state}
+
+
+@app.route('/api/stats')
+def api_stats():
+    """API: Get statistics"""
+    return jsonify({**api_stats_data(scan_epoch()), 'gridstatus_available': GRIDSTATUS_AVAILABLE})
 
 
 @app.route('/api/projects')
@@ -1338,20 +2198,40 @@ def api_projects():
     offset = request.args.get('offset', 0, type=int)
     min_score = request.args.get('min_score', 0, type=int)
     
-    projects = db.fetchall('''
-        SELECT * FROM projects WHERE hunter_score >= ?
-        ORDER BY hunter_score DESC, capacity_mw DESC
+    # ?after=<X-Next-Cursor of the previous response> pages without OFFSET
+    where_clause = 'hunter_score >= ?'
+    params = [min_score]
+    after = parse_cursor(request.args.get('after', ''))
+    if after:
+        where_clause += f' AND {KEYSET_CLAUSE}'
+        params += keyset_params(after)
+        offset = 0
+    
+    # Named columns: content_hash is internal bookkeeping and not JSON-serializable
+    projects = db.fetchall(f'''
+        SELECT id, request_id, project_name, capacity_mw, county, state, customer, utility,
+               status, fuel_type, source, source_url, project_type, hunter_score, data_hash,
+               first_seen, last_updated
+        FROM projects WHERE {where_clause}
+        ORDER BY hunter_score DESC, capacity_mw DESC, id
         LIMIT ? OFFSET ?
-    ''', (min_score, limit, offset))
+    ''', params + [limit, offset])
     
-    return jsonify([dict(p) for p in projects])
+    response = jsonify([dict(p) for p in projects])
+    if projects:
+        response.headers['X-Next-Cursor'] = cursor_for(projects[-1])
+    return response
 
 
 @app.route('/api/sync', methods=['POST'])
 def api_sync():
-    """API: Trigger sync"""
-    result = monitor.run_comprehensive_monitoring()
-    return jsonify(result)
+    """API: Queue a sync and return 202 with its job id, or 409 if one is pending"""
+    # Goes through start_scan so it can never overlap a /trigger scan
+    job_id, created = start_scan()
+    if not created:
+        return jsonify({'status': 'busy', 'job_id': job_id}), 409
+    return jsonify({'status': 'queued', 'job_id': job_id,
+                    'status_url': url_for('trigger_status', job_id=job_id)}), 202
 
 
 # =============================================================================
@@ -1361,20 +2241,26 @@ def api_sync():
 def init_app():
     """Initialize application"""
     os.makedirs(DATA_DIR, exist_ok=True)
-    logger.info(f"Power Monitor v{APP_VERSION} starting. gridstatus: {GRIDSTATUS_AVAILABLE}")
-    
-    # Check if we need initial sync
+    logger.info(f"Power Monitor v{APP_VERSION} starting. gridstatus: {GRIDSTATUS_AVAILABLE}, excel engine: {EXCEL_ENGINE}")
+
+
+def sync_if_empty():
+    """Queue the first sync when the database has no projects yet"""
     count = db.fetchone('SELECT COUNT(*) as count FROM projects')['count']
     if count == 0:
-        logger.info("No projects in database, running initial sync...")
-        try:
-            monitor.run_comprehensive_monitoring()
-        except Exception as e:
-            logger.error(f"Initial sync failed: {e}")
+        # In the background, so the app can serve requests while the first
+        # sync downloads every queue
+        job_id, _ = start_scan()
+        logger.info(f"No projects in database, initial sync queued as job {job_id}")
 
 
 init_app()
 
 
 if __name__ == '__main__':
+    # Never at import: under gunicorn the worker process (Procfile) runs the
+    # first scan. The debug reloader runs this block in both its watcher and
+    # the serving child; only the child, which sets WERKZEUG_RUN_MAIN, syncs.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        sync_if_empty()
     app.run(host='0.0.0.0', port=8080, debug=True)
@@ -17,24 +17,34 @@ Expected: 8,500+ projects
 
 import os
 import sys
+import csv
+import io
 import json
 import hashlib
 import logging
 import re
 import time
 import sqlite3
+import tempfile
 import threading
-from datetime import datetime, timedelta
-from io import BytesIO, StringIO
-from functools import wraps
+import uuid
+import signal
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache, wraps
 
 import requests
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
+import lxml.html
 from flask import Flask, render_template, jsonify, request, redirect, url_for, Response
+from flask.json.provider import DefaultJSONProvider
+from requests.adapters import HTTPAdapter
 import urllib3
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from urllib3.util.retry import Retry
 
 try:
     import gridstatus
@@ -42,6 +52,22 @@ try:
 except ImportError:
     GRIDSTATUS_AVAILABLE = False
 
+# calamine (Rust) parses xlsx several times faster than openpyxl; pandas
+# (pinned >= 2.2) accepts it as an engine
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+EXCEL_ENGINE = 'calamine' if CALAMINE_AVAILABLE else 'openpyxl'
+
+# orjson parses and serializes JSON several times faster than the json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -51,13 +77,60 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() through orjson, keeping Flask's sorted keys and date format"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 DB_PATH = os.environ.get('DATABASE_PATH', '/app/data/power_monitor.db')
 DATA_DIR = os.environ.get('DATA_DIR', '/app/data')
 
+# gridstatus queues are re-downloaded at most this often (seconds)
+GRIDSTATUS_CACHE_TTL = int(os.environ.get('GRIDSTATUS_CACHE_TTL', 6 * 3600))
+
+VERIFY_SSL = os.environ.get('VERIFY_SSL', 'true').lower() != 'false'
+if not VERIFY_SSL:
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 
 # =============================================================================
 # Database
 # =============================================================================
+# Trigram full-text index behind the /projects search box, kept in step with
+# projects by triggers; the scan's upserts fire the UPDATE trigger
+SEARCH_INDEX_SQL = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_search USING fts5(
+        project_name, customer, county,
+        content='projects', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS projects_search_insert AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_search (rowid, project_name, customer, county)
+        VALUES (new.id, new.project_name, new.customer, new.county);
+    END;
+    CREATE TRIGGER IF NOT EXISTS projects_search_delete AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_search (projects_search, rowid, project_name, customer, county)
+        VALUES ('delete', old.id, old.project_name, old.customer, old.county);
+    END;
+    CREATE TRIGGER IF NOT EXISTS projects_search_update
+    AFTER UPDATE OF project_name, customer, county ON projects BEGIN
+        INSERT INTO projects_search (projects_search, rowid, project_name, customer, county)
+        VALUES ('delete', old.id, old.project_name, old.customer, old.county);
+        INSERT INTO projects_search (rowid, project_name, customer, county)
+        VALUES (new.id, new.project_name, new.customer, new.county);
+    END;
+'''
+
+
 class Database:
     def __init__(self, db_path):
         self.db_path = db_path
@@ -67,12 +140,24 @@ class Database:
     def _get_conn(self):
         if not hasattr(self.local, 'conn') or self.local.conn is None:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            self.local.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # A larger statement cache keeps the scan's upserts and every route's
+            # queries compiled for the life of the connection. One connection per
+            # thread, so gunicorn's threads read side by side under WAL; a write
+            # that meets the scan's transaction waits up to 30s for the lock
+            # instead of failing after the default 5s.
+            self.local.conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                              cached_statements=256, timeout=30)
             self.local.conn.row_factory = sqlite3.Row
+            # Per-connection settings: in WAL mode NORMAL only fsyncs at checkpoints
+            self.local.conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn.execute('PRAGMA temp_store=MEMORY')
+            self.local.conn.execute('PRAGMA cache_size=-65536')
         return self.local.conn
     
     def _init_db(self):
         conn = self._get_conn()
+        # Stored in the database file: readers no longer block the sync's writes
+        conn.execute('PRAGMA journal_mode=WAL')
         conn.executescript('''
             CREATE TABLE IF NOT EXISTS projects (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -90,6 +175,7 @@ class Database:
                 project_type TEXT,
                 hunter_score INTEGER DEFAULT 0,
                 data_hash TEXT,
+                content_hash BLOB,
                 first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
@@ -124,12 +210,62 @@ class Database:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
             
-            CREATE INDEX IF NOT EXISTS idx_projects_utility ON projects(utility);
-            CREATE INDEX IF NOT EXISTS idx_projects_state ON projects(state);
-            CREATE INDEX IF NOT EXISTS idx_projects_type ON projects(project_type);
-            CREATE INDEX IF NOT EXISTS idx_projects_score ON projects(hunter_score);
+            -- Small values remembered between syncs, such as a working mirror URL
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            
+            -- Manual and API syncs, shared by every web worker and the scheduler
+            CREATE TABLE IF NOT EXISTS scan_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                result TEXT,
+                error TEXT
+            );
+            
+            -- Covers the dashboard's per-utility count and MW totals
+            DROP INDEX IF EXISTS idx_projects_utility;
+            CREATE INDEX IF NOT EXISTS idx_projects_utility_capacity ON projects(utility, capacity_mw);
+            -- Matches the ORDER BY of /projects, /export and /api/projects so
+            -- SQLite can walk the index instead of sorting the whole table
+            DROP INDEX IF EXISTS idx_projects_score;
+            CREATE INDEX IF NOT EXISTS idx_projects_score_capacity ON projects(hunter_score DESC, capacity_mw DESC);
+            -- Same ordering behind the state and datacenter filters of /projects
+            DROP INDEX IF EXISTS idx_projects_state;
+            CREATE INDEX IF NOT EXISTS idx_projects_state_score ON projects(state, hunter_score DESC, capacity_mw DESC);
+            DROP INDEX IF EXISTS idx_projects_type;
+            CREATE INDEX IF NOT EXISTS idx_projects_type_score ON projects(project_type, hunter_score DESC, capacity_mw DESC);
+            -- Dashboard "recently discovered" list
+            CREATE INDEX IF NOT EXISTS idx_projects_first_seen ON projects(first_seen);
+            -- Covers the per-source last sync and totals on /monitoring, so the
+            -- GROUP BY reads the index in order instead of sorting the whole log
+            CREATE INDEX IF NOT EXISTS idx_sync_log_source_time ON sync_log(source, sync_time, projects_found);
+            -- Newest-first run lists on / and /monitoring, read backwards off
+            -- the index instead of sorting every run ever logged
+            CREATE INDEX IF NOT EXISTS idx_monitor_runs_date ON monitor_runs(run_date);
         ''')
+        # Databases created before content_hash was added
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(projects)')}
+        if 'content_hash' not in columns:
+            conn.execute('ALTER TABLE projects ADD COLUMN content_hash BLOB')
         conn.commit()
+        # The trigram tokenizer needs SQLite 3.34+; without it search falls
+        # back to LIKE over the table
+        try:
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'projects_search'").fetchone()
+            conn.executescript(SEARCH_INDEX_SQL)
+            if not exists:
+                # Index the projects stored before the search table existed
+                conn.execute("INSERT INTO projects_search (projects_search) VALUES ('rebuild')")
+                conn.commit()
+            self.search_index = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Search index unavailable, using LIKE: {e}")
+            self.search_index = False
     
     def execute(self, query, params=()):
         conn = self._get_conn()
@@ -137,72 +273,389 @@ class Database:
         conn.commit()
         return cursor
     
+    def executemany(self, query, seq_of_params):
+        with self.transaction() as conn:
+            return conn.executemany(query, seq_of_params)
+    
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one commit, rolled back if any fails"""
+        conn = self._get_conn()
+        with conn:
+            yield conn
+    
     def fetchall(self, query, params=()):
         return self._get_conn().execute(query, params).fetchall()
     
     def fetchone(self, query, params=()):
         return self._get_conn().execute(query, params).fetchone()
+    
+    def iterate(self, query, params=()):
+        """Rows of query as they are stepped through, without fetching them all"""
+        return self._get_conn().execute(query, params)
+    
+    def get_setting(self, key, default=None):
+        row = self.fetchone('SELECT value FROM settings WHERE key = ?', (key,))
+        return row['value'] if row else default
+    
+    def set_setting(self, key, value):
+        self.execute('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', (key, value))
 
 
 db = Database(DB_PATH)
 
 
+# First number in capacity text such as "150 (summer)"
+CAPACITY_NUMBER_RE = re.compile(r'(\d+\.?\d*)')
+
+
+def coalesce_columns(df, columns):
+    """Per row, the first of columns with a value, skipping blanks and zeros"""
+    result = pd.Series(np.nan, index=df.index, dtype=object)
+    for col in reversed(columns):
+        if col in df.columns:
+            values = df[col]
+            present = values.notna() & (values != 0) & (values != '')
+            result = values.where(present, result)
+    return result
+
+
+# ISO-NE queue columns: field -> (candidate columns, default when absent)
+ISONE_FIELDS = {
+    'id': (['QP'], None),
+    'name': (['Alternative Name', 'Unit'], 'Unknown'),
+    'county': (['County'], ''),
+    'state': (['ST'], 'MA'),
+    'status': (['Status'], 'Active'),
+    'fuel': (['Fuel Type'], ''),
+}
+
+
+def field_columns(df, fields):
+    """Per-row values of each field in fields, as lists in the same order.
+
+    Columns are resolved once per frame, so the row loop just zips the lists
+    instead of looking every field up in a per-row dict. Fields with a
+    default come back as str; the None-default id field keeps raw values.
+    """
+    columns = []
+    for candidates, default in fields.values():
+        col = next((c for c in candidates if c in df.columns), None)
+        if col is not None:
+            values = df[col]
+            if default is not None:
+                # Text fields are converted once per column, and blank cells
+                # take the default instead of turning into the string 'nan'
+                values = values.astype('string').fillna(default)
+            columns.append(values.tolist())
+        elif default is None:
+            columns.append(df.index.tolist())
+        else:
+            columns.append([default] * len(df))
+    return columns
+
+
+def cell_text(element):
+    """Text of an lxml element, each fragment stripped and joined as BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+def parse_html_table(content):
+    """First <table> of an HTML page as (number of body rows, DataFrame).
+
+    Columns are the table's <th> texts. Only rows with at least that many
+    <td> cells are kept, their cells matched to the headers by position.
+    """
+    root = lxml.html.fromstring(content)
+    table = next(root.iter('table'), None)
+    if table is None:
+        return 0, None
+    headers = [cell_text(th) for th in table.iter('th')]
+    rows = list(table.iter('tr'))[1:]
+    records = []
+    for row in rows:
+        cells = [cell_text(td) for td in row.iter('td')]
+        if len(cells) >= len(headers):
+            records.append(dict(zip(headers, cells)))
+    return len(rows), pd.DataFrame.from_records(records)
+
+
+def json_loads(data):
+    """Parse JSON bytes or text, with orjson when it is installed"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def pack_projects(projects):
+    """Projects as (keys, rows): one shared key tuple and a value tuple per project.
+
+    A source's projects all have the same fields, so long-lived caches keep
+    them this way rather than as a dict each, at a fraction of the memory.
+    """
+    keys = tuple(projects[0]) if projects else ()
+    return keys, [tuple(p[k] for k in keys) for p in projects]
+
+
+def unpack_projects(packed):
+    """Fresh project dicts from pack_projects output"""
+    keys, rows = packed
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def file_digest(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(values):
+    """Short digest of a stored row, used to skip rewriting unchanged projects.
+
+    Kept as the raw 16 bytes rather than hex, which would double its width
+    in every row.
+    """
+    text = '\x1f'.join('' if v is None else str(v) for v in values)
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def text_column(df, col):
+    """df[col] as text, or blank strings when the column is absent"""
+    if col is None or col not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[col].astype(str)
+
+
+def keyword_pattern(keywords):
+    """Compile a list of literal keywords into a single alternation regex"""
+    return re.compile('|'.join(re.escape(kw) for kw in keywords))
+
+
+def contains_pattern(series, pattern):
+    """Boolean array: does each string in series match pattern?
+
+    Queue rows repeat the same developer and fuel strings heavily, so each
+    distinct string is searched once and the result broadcast back.
+    """
+    codes, uniques = pd.factorize(series)
+    matched = np.append(np.asarray(uniques.str.contains(pattern), dtype=bool), False)
+    return matched[codes]  # code -1 (missing) picks the trailing False
+
+
+def first_match(series, labelled_patterns, default):
+    """Array of the label of the first (label, pattern) matching each string.
+
+    Like contains_pattern, every distinct string is searched once; the
+    factorization is shared by all the patterns rather than redone per pattern.
+    """
+    codes, uniques = pd.factorize(series)
+    conditions = [np.asarray(uniques.str.contains(pattern), dtype=bool) for _, pattern in labelled_patterns]
+    labels = np.select(conditions, [label for label, _ in labelled_patterns], default=default)
+    return np.append(labels, default)[codes]  # code -1 (missing) picks the default
+
+
 # =============================================================================
 # Power Monitor Class
 # =============================================================================
 class HybridPowerMonitor:
     """Complete power monitor with all 7 ISOs + Berkeley Lab backup"""
     
+    # Unit suffixes stripped from capacity text before parsing
+    CAPACITY_SUFFIXES = ('MW', 'mw', 'Mw', 'MEGAWATT')
+    
     def __init__(self, min_capacity_mw=100):
         self.min_capacity_mw = min_capacity_mw
         self.session = requests.Session()
-        self.session.verify = False
+        # Certificate checks are on unless VERIFY_SSL=false is set for a host with a broken chain
+        self.session.verify = VERIFY_SSL
+        # Keep-alive pool per host, with retries on throttling and transient 5xx
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': '*/*',
             'Accept-Language': 'en-US,en;q=0.9',
         })
         self.berkeley_lab_cache = {}  # Cache by utility
+        self.parsed_cache = {}  # source -> (content digest, packed parsed projects)
+        self.gridstatus_cache = {}  # ISO class name -> (fetch time, queue DataFrame)
     
     def extract_capacity(self, value):
-        if pd.isna(value) or value is None or value == '':
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Numeric cells need no text parsing; NaN fails the comparison
+            return float(value) if value >= self.min_capacity_mw else None
+        if value is None or pd.isna(value) or value == '':
             return None
         text = str(value).replace(',', '').strip()
-        for suffix in ['MW', 'mw', 'Mw', 'MEGAWATT']:
+        for suffix in self.CAPACITY_SUFFIXES:
             text = text.replace(suffix, '')
         text = text.strip()
         try:
             capacity = float(text)
-            return capacity if capacity >= self.min_capacity_mw else None
         except ValueError:
-            match = re.search(r'(\d+\.?\d*)', text)
-            if match:
+            match = CAPACITY_NUMBER_RE.search(text)
+            if not match:
+                return None
+            capacity = float(match.group(1))
+        return capacity if capacity >= self.min_capacity_mw else None
+    
+    def extract_capacities(self, values):
+        """Vectorized extract_capacity over a Series; NaN where it would return None"""
+        if pd.api.types.is_numeric_dtype(values):
+            capacity = values.astype(float)
+        else:
+            text = values.astype(str).str.replace(',', '', regex=False).str.strip()
+            for suffix in self.CAPACITY_SUFFIXES:
+                text = text.str.replace(suffix, '', regex=False)
+            text = text.str.strip()
+            capacity = pd.to_numeric(text, errors='coerce')
+            # Fall back to the first number in strings like "150 (summer)"
+            capacity = capacity.fillna(text.str.extract(CAPACITY_NUMBER_RE, expand=False).astype(float))
+            capacity[values.isna() | (values == '')] = np.nan
+        return capacity.where(capacity >= self.min_capacity_mw)
+    
+    def first_capacity(self, df, columns):
+        """Per row, the first of columns holding a valid capacity (NaN if none)"""
+        capacity = pd.Series(np.nan, index=df.index)
+        for col in columns:
+            if col in df.columns:
+                capacity = capacity.fillna(self.extract_capacities(df[col]))
+        return capacity
+    
+    def gridstatus_queue(self, iso):
+        """gridstatus interconnection queue for iso ('CAISO', 'Ercot').
+
+        gridstatus downloads and parses the whole upstream file on every call,
+        and the queues change at most daily, so a frame is reused for
+        GRIDSTATUS_CACHE_TTL. Callers get a copy they are free to modify.
+        """
+        fetched_at, df = self.gridstatus_cache.get(iso, (0, None))
+        if df is None or time.time() - fetched_at > GRIDSTATUS_CACHE_TTL:
+            df = getattr(gridstatus, iso)().get_interconnection_queue()
+            self.gridstatus_cache[iso] = (time.time(), df)
+        else:
+            logger.info(f"{iso}: Reusing gridstatus queue from {(time.time() - fetched_at) / 60:.0f} min ago")
+        return df.copy()
+    
+    def cached_projects(self, source, digest):
+        """Copies of the projects parsed last time, if the content digest is unchanged.
+
+        Queue files mostly repeat between syncs, so this skips re-parsing,
+        scoring and hashing every row of an identical download.
+        """
+        cached_digest, packed = self.parsed_cache.get(source, (None, None))
+        if cached_digest != digest:
+            return None
+        projects = unpack_projects(packed)
+        logger.info(f"{source}: Content unchanged, reusing {len(projects)} parsed projects")
+        return projects
+    
+    def store_parsed(self, source, digest, projects):
+        """Remember the projects parsed from content with this digest"""
+        self.parsed_cache[source] = (digest, pack_projects(projects))
+    
+    def available_first(self, urls, **kwargs):
+        """urls reordered so those answering a HEAD request with 200 come first.
+
+        The probes run side by side, so dead mirrors cost one short timeout in
+        total instead of a full download timeout each; order is otherwise kept.
+        """
+        def probe(url):
+            try:
+                return self.session.head(url, allow_redirects=True, timeout=15, **kwargs).status_code == 200
+            except requests.exceptions.RequestException:
+                return False
+
+        with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+            live = list(pool.map(probe, urls))
+        return [url for url, ok in zip(urls, live) if ok] + [url for url, ok in zip(urls, live) if not ok]
+
+    def berkeley_lab_urls(self, urls, **kwargs):
+        """Berkeley Lab URLs to try: the last one that worked, then the live ones.
+
+        A generator, so the HEAD probes of the other mirrors only run if the
+        remembered URL fails; usually the first download is the only request.
+        """
+        remembered = db.get_setting('berkeley_lab_url')
+        if remembered in urls:
+            yield remembered
+            urls = [url for url in urls if url != remembered]
+        yield from self.available_first(urls, **kwargs)
+    
+    def download_to_temp(self, url, suffix, **kwargs):
+        """Stream url into a temporary file and return its path (None unless HTTP 200).
+
+        Large queue files go to disk in chunks instead of being held in memory
+        as response.content; the caller removes the file when done.
+        """
+        with self.session.get(url, stream=True, **kwargs) as response:
+            if response.status_code != 200:
+                return None
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
                 try:
-                    return float(match.group(1)) if float(match.group(1)) >= self.min_capacity_mw else None
-                except:
-                    pass
-        return None
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        tmp.write(chunk)
+                except Exception:
+                    # Don't leave a partial download behind
+                    tmp.close()
+                    os.unlink(tmp.name)
+                    raise
+        return tmp.name
     
     def generate_hash(self, data):
-        key = f"{data.get('project_name', '')}_{data.get('capacity_mw', 0)}_{data.get('state', '')}_{data.get('utility', '')}"
-        return hashlib.md5(key.lower().encode()).hexdigest()
+        # '|' cannot be confused with the underscores common in project names;
+        # an 8-byte blake2b is ample for identifying a project and half MD5's width
+        key = f"{data.get('project_name', '')}|{data.get('capacity_mw', 0)}|{data.get('state', '')}|{data.get('utility', '')}"
+        return hashlib.blake2b(key.lower().encode(), digest_size=8).hexdigest()
+    
+    # First match wins, in this order
+    PROJECT_TYPE_PATTERNS = [
+        ('datacenter', keyword_pattern(['data center', 'datacenter', 'cloud', 'hyperscale', 'colocation',
+                                        'microsoft', 'amazon', 'google', 'meta', 'aws', 'facebook'])),
+        ('storage', keyword_pattern(['battery', 'storage', 'bess', 'energy storage'])),
+        ('solar', keyword_pattern(['solar', 'photovoltaic', 'pv '])),
+        ('wind', keyword_pattern(['wind', 'offshore'])),
+        ('gas', keyword_pattern(['natural gas', 'gas turbine', 'combined cycle', 'peaker', 'ccgt'])),
+        ('nuclear', keyword_pattern(['nuclear'])),
+    ]
     
     def classify_project(self, name, customer='', fuel_type=''):
         text = f"{name} {customer} {fuel_type}".lower()
-        if any(kw in text for kw in ['data center', 'datacenter', 'cloud', 'hyperscale', 'colocation', 'microsoft', 'amazon', 'google', 'meta', 'aws', 'facebook']):
-            return 'datacenter'
-        if any(kw in text for kw in ['battery', 'storage', 'bess', 'energy storage']):
-            return 'storage'
-        if any(kw in text for kw in ['solar', 'photovoltaic', 'pv ']):
-            return 'solar'
-        if any(kw in text for kw in ['wind', 'offshore']):
-            return 'wind'
-        if any(kw in text for kw in ['natural gas', 'gas turbine', 'combined cycle', 'peaker', 'ccgt']):
-            return 'gas'
-        if any(kw in text for kw in ['nuclear']):
-            return 'nuclear'
+        for project_type, pattern in self.PROJECT_TYPE_PATTERNS:
+            if pattern.search(text):
+                return project_type
         return 'other'
     
+    def classify_projects(self, names, customers='', fuel_types=''):
+        """Vectorized classify_project; each argument is a Series or a constant string"""
+        text = (names + ' ' + customers + ' ' + fuel_types).str.lower()
+        return first_match(text, self.PROJECT_TYPE_PATTERNS, 'other').tolist()
+    
+    # Berkeley Lab entity/region text -> utility, first match wins
+    ENTITY_UTILITY_PATTERNS = [
+        ('PJM', keyword_pattern(['PJM'])),
+        ('MISO', keyword_pattern(['MISO'])),
+        ('CAISO', keyword_pattern(['CAISO', 'CALIFORNIA'])),
+        ('ERCOT', keyword_pattern(['ERCOT', 'TEXAS'])),
+        ('SPP', keyword_pattern(['SPP'])),
+        ('NYISO', keyword_pattern(['NYISO', 'NEW YORK'])),
+        ('ISO-NE', keyword_pattern(['ISO-NE', 'ISONE', 'NEW ENGLAND'])),
+    ]
+    
+    def map_entities(self, entities):
+        """Vectorized Berkeley Lab entity/region -> utility name"""
+        entity = entities.map(str).str.upper()
+        utilities = first_match(entity, self.ENTITY_UTILITY_PATTERNS, '')
+        fallback = entity.str[:20].where(entity != '', 'Other')
+        return np.where(utilities != '', utilities, fallback.to_numpy()).tolist()
+    
     def calculate_hunter_score(self, project):
         """Calculate datacenter likelihood score (0-100)"""
         score = 0
@@ -253,30 +706,33 @@ class HybridPowerMonitor:
             return projects
         try:
             logger.info("CAISO: Fetching via gridstatus")
-            caiso = gridstatus.CAISO()
-            df = caiso.get_interconnection_queue()
+            df = self.gridstatus_queue('CAISO')
             logger.info(f"CAISO: Found {len(df)} rows")
             
-            for _, row in df.iterrows():
-                capacity = self.extract_capacity(row.get('Capacity (MW)', 0))
-                if capacity:
-                    data = {
-                        'request_id': f"CAISO_{row.get('Queue ID', row.name)}",
-                        'project_name': str(row.get('Project Name', 'Unknown'))[:500],
-                        'capacity_mw': capacity,
-                        'county': str(row.get('County', ''))[:200],
-                        'state': 'CA',
-                        'customer': str(row.get('Interconnection Customer', ''))[:500],
-                        'utility': 'CAISO',
-                        'status': str(row.get('Status', 'Active')),
-                        'fuel_type': str(row.get('Fuel', '')),
-                        'source': 'CAISO',
-                        'source_url': 'gridstatus',
-                        'project_type': self.classify_project(str(row.get('Project Name', '')), str(row.get('Interconnection Customer', '')), str(row.get('Fuel', '')))
-                    }
-                    data['hunter_score'] = self.calculate_hunter_score(data)
-                    data['data_hash'] = self.generate_hash(data)
-                    projects.append(data)
+            # Parse and filter capacities column-wise before building any rows
+            capacities = self.first_capacity(df, ['Capacity (MW)'])
+            df, capacities = df[capacities.notna()], capacities.dropna()
+            project_types = self.classify_projects(text_column(df, 'Project Name'),
+                                                   text_column(df, 'Interconnection Customer'),
+                                                   text_column(df, 'Fuel'))
+            for idx, row, capacity, project_type in zip(df.index, df.to_dict('records'), capacities.tolist(), project_types):
+                data = {
+                    'request_id': f"CAISO_{row.get('Queue ID', idx)}",
+                    'project_name': str(row.get('Project Name', 'Unknown'))[:500],
+                    'capacity_mw': capacity,
+                    'county': str(row.get('County', ''))[:200],
+                    'state': 'CA',
+                    'customer': str(row.get('Interconnection Customer', ''))[:500],
+                    'utility': 'CAISO',
+                    'status': str(row.get('Status', 'Active')),
+                    'fuel_type': str(row.get('Fuel', '')),
+                    'source': 'CAISO',
+                    'source_url': 'gridstatus',
+                    'project_type': project_type
+                }
+                data['hunter_score'] = self.calculate_hunter_score(data)
+                data['data_hash'] = self.generate_hash(data)
+                projects.append(data)
             logger.info(f"CAISO: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"CAISO failed: {e}")
@@ -290,36 +746,41 @@ class HybridPowerMonitor:
         url = 'https://www.nyiso.com/documents/20142/1407078/NYISO-Interconnection-Queue.xlsx'
         try:
             logger.info(f"NYISO: Fetching from {url}")
-            response = self.session.get(url, timeout=60)
-            if response.status_code == 200:
-                df = pd.read_excel(BytesIO(response.content))
+            path = self.download_to_temp(url, '.xlsx', timeout=60)
+            if path is not None:
+                try:
+                    digest = file_digest(path)
+                    cached = self.cached_projects('NYISO', digest)
+                    if cached is not None:
+                        return cached
+                    df = pd.read_excel(path, sheet_name=0, engine=EXCEL_ENGINE)
+                finally:
+                    os.unlink(path)
                 logger.info(f"NYISO: Found {len(df)} rows")
                 mw_cols = [c for c in df.columns if 'MW' in str(c).upper()]
                 
-                for _, row in df.iterrows():
-                    capacity = None
-                    for col in mw_cols:
-                        capacity = self.extract_capacity(row.get(col))
-                        if capacity:
-                            break
-                    if capacity:
-                        data = {
-                            'request_id': f"NYISO_{row.get('Queue Position', row.name)}",
-                            'project_name': str(row.get('Project Name', row.get('Proposed Name', 'Unknown')))[:500],
-                            'capacity_mw': capacity,
-                            'county': str(row.get('County', ''))[:200],
-                            'state': 'NY',
-                            'customer': str(row.get('Developer', ''))[:500],
-                            'utility': 'NYISO',
-                            'status': str(row.get('Status', 'Active')),
-                            'fuel_type': str(row.get('Type', '')),
-                            'source': 'NYISO',
-                            'source_url': url,
-                            'project_type': self.classify_project(str(row.get('Project Name', '')), '', str(row.get('Type', '')))
-                        }
-                        data['hunter_score'] = self.calculate_hunter_score(data)
-                        data['data_hash'] = self.generate_hash(data)
-                        projects.append(data)
+                capacities = self.first_capacity(df, mw_cols)
+                df, capacities = df[capacities.notna()], capacities.dropna()
+                project_types = self.classify_projects(text_column(df, 'Project Name'), '', text_column(df, 'Type'))
+                for idx, row, capacity, project_type in zip(df.index, df.to_dict('records'), capacities.tolist(), project_types):
+                    data = {
+                        'request_id': f"NYISO_{row.get('Queue Position', idx)}",
+                        'project_name': str(row.get('Project Name', row.get('Proposed Name', 'Unknown')))[:500],
+                        'capacity_mw': capacity,
+                        'county': str(row.get('County', ''))[:200],
+                        'state': 'NY',
+                        'customer': str(row.get('Developer', ''))[:500],
+                        'utility': 'NYISO',
+                        'status': str(row.get('Status', 'Active')),
+                        'fuel_type': str(row.get('Type', '')),
+                        'source': 'NYISO',
+                        'source_url': url,
+                        'project_type': project_type
+                    }
+                    data['hunter_score'] = self.calculate_hunter_score(data)
+                    data['data_hash'] = self.generate_hash(data)
+                    projects.append(data)
+                self.store_parsed('NYISO', digest, projects)
                 logger.info(f"NYISO: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"NYISO failed: {e}")
@@ -335,41 +796,39 @@ class HybridPowerMonitor:
             logger.info(f"ISO-NE: Fetching from {url}")
             response = self.session.get(url, timeout=60)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                table = soup.find('table')
-                if table:
-                    headers = [th.get_text(strip=True) for th in table.find_all('th')]
-                    rows = table.find_all('tr')[1:]
-                    logger.info(f"ISO-NE: Found {len(rows)} rows")
+                digest = hashlib.sha256(response.content).hexdigest()
+                cached = self.cached_projects('ISO-NE', digest)
+                if cached is not None:
+                    return cached
+                row_count, df = parse_html_table(response.content)
+                if df is not None:
+                    logger.info(f"ISO-NE: Found {row_count} rows")
                     
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= len(headers):
-                            row_data = {headers[i]: cells[i].get_text(strip=True) for i in range(len(headers))}
-                            capacity = None
-                            for mw_col in ['Net MW', 'Summer MW', 'Winter MW', 'MW']:
-                                if mw_col in row_data:
-                                    capacity = self.extract_capacity(row_data.get(mw_col))
-                                    if capacity:
-                                        break
-                            if capacity:
-                                data = {
-                                    'request_id': f"ISONE_{row_data.get('QP', len(projects))}",
-                                    'project_name': str(row_data.get('Alternative Name', row_data.get('Unit', 'Unknown')))[:500],
-                                    'capacity_mw': capacity,
-                                    'county': str(row_data.get('County', ''))[:200],
-                                    'state': str(row_data.get('ST', 'MA'))[:2],
-                                    'customer': '',
-                                    'utility': 'ISO-NE',
-                                    'status': str(row_data.get('Status', 'Active')),
-                                    'fuel_type': str(row_data.get('Fuel Type', '')),
-                                    'source': 'ISO-NE',
-                                    'source_url': url,
-                                    'project_type': self.classify_project(row_data.get('Alternative Name', ''), '', row_data.get('Fuel Type', ''))
-                                }
-                                data['hunter_score'] = self.calculate_hunter_score(data)
-                                data['data_hash'] = self.generate_hash(data)
-                                projects.append(data)
+                    capacities = self.first_capacity(df, ['Net MW', 'Summer MW', 'Winter MW', 'MW'])
+                    # Renumber so rows without a QP fall back to their position among the kept rows
+                    keep = capacities.notna().to_numpy()
+                    df, capacities = df[keep].reset_index(drop=True), capacities[keep].reset_index(drop=True)
+                    project_types = self.classify_projects(text_column(df, 'Alternative Name'), '', text_column(df, 'Fuel Type'))
+                    for queue_id, name, county, state, status, fuel, capacity, project_type in zip(
+                            *field_columns(df, ISONE_FIELDS), capacities.tolist(), project_types):
+                        data = {
+                            'request_id': f"ISONE_{queue_id}",
+                            'project_name': name[:500],
+                            'capacity_mw': capacity,
+                            'county': county[:200],
+                            'state': state[:2],
+                            'customer': '',
+                            'utility': 'ISO-NE',
+                            'status': status,
+                            'fuel_type': fuel,
+                            'source': 'ISO-NE',
+                            'source_url': url,
+                            'project_type': project_type
+                        }
+                        data['hunter_score'] = self.calculate_hunter_score(data)
+                        data['data_hash'] = self.generate_hash(data)
+                        projects.append(data)
+                    self.store_parsed('ISO-NE', digest, projects)
                     logger.info(f"ISO-NE: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"ISO-NE failed: {e}")
@@ -383,43 +842,52 @@ class HybridPowerMonitor:
         url = 'https://opsportal.spp.org/Studies/GenerateActiveCSV'
         try:
             logger.info(f"SPP: Fetching from {url}")
-            response = self.session.get(url, timeout=60)
-            if response.status_code == 200:
-                lines = response.text.split('\n')
-                header_idx = 0
-                for i, line in enumerate(lines[:10]):
-                    if 'MW' in line or 'Generation' in line:
-                        header_idx = i
-                        break
-                csv_data = '\n'.join(lines[header_idx:])
-                df = pd.read_csv(StringIO(csv_data))
+            path = self.download_to_temp(url, '.csv', timeout=60)
+            if path is not None:
+                try:
+                    digest = file_digest(path)
+                    cached = self.cached_projects('SPP', digest)
+                    if cached is not None:
+                        return cached
+                    # Find the header in the first few lines, then let the
+                    # parser stream the rest straight from the file
+                    with open(path, encoding='utf-8', errors='replace') as f:
+                        header_offset = 0
+                        for _ in range(10):
+                            offset = f.tell()
+                            line = f.readline()
+                            if 'MW' in line or 'Generation' in line:
+                                header_offset = offset
+                                break
+                        f.seek(header_offset)
+                        df = pd.read_csv(f)
+                finally:
+                    os.unlink(path)
                 logger.info(f"SPP: Found {len(df)} rows")
                 mw_cols = [c for c in df.columns if 'MW' in str(c).upper()]
                 
-                for _, row in df.iterrows():
-                    capacity = None
-                    for col in mw_cols:
-                        capacity = self.extract_capacity(row.get(col))
-                        if capacity:
-                            break
-                    if capacity:
-                        data = {
-                            'request_id': f"SPP_{row.get('Generation Interconnection Number', row.name)}",
-                            'project_name': str(row.get('Project Name', 'Unknown'))[:500],
-                            'capacity_mw': capacity,
-                            'county': str(row.get(' Nearest Town or County', ''))[:200],
-                            'state': str(row.get('State', ''))[:2],
-                            'customer': '',
-                            'utility': 'SPP',
-                            'status': str(row.get('Status', 'Active')),
-                            'fuel_type': str(row.get('Fuel Type', row.get('Generation Type', ''))),
-                            'source': 'SPP',
-                            'source_url': url,
-                            'project_type': self.classify_project(str(row.get('Project Name', '')), '', str(row.get('Fuel Type', '')))
-                        }
-                        data['hunter_score'] = self.calculate_hunter_score(data)
-                        data['data_hash'] = self.generate_hash(data)
-                        projects.append(data)
+                capacities = self.first_capacity(df, mw_cols)
+                df, capacities = df[capacities.notna()], capacities.dropna()
+                project_types = self.classify_projects(text_column(df, 'Project Name'), '', text_column(df, 'Fuel Type'))
+                for idx, row, capacity, project_type in zip(df.index, df.to_dict('records'), capacities.tolist(), project_types):
+                    data = {
+                        'request_id': f"SPP_{row.get('Generation Interconnection Number', idx)}",
+                        'project_name': str(row.get('Project Name', 'Unknown'))[:500],
+                        'capacity_mw': capacity,
+                        'county': str(row.get(' Nearest Town or County', ''))[:200],
+                        'state': str(row.get('State', ''))[:2],
+                        'customer': '',
+                        'utility': 'SPP',
+                        'status': str(row.get('Status', 'Active')),
+                        'fuel_type': str(row.get('Fuel Type', row.get('Generation Type', ''))),
+                        'source': 'SPP',
+                        'source_url': url,
+                        'project_type': project_type
+                    }
+                    data['hunter_score'] = self.calculate_hunter_score(data)
+                    data['data_hash'] = self.generate_hash(data)
+                    projects.append(data)
+                self.store_parsed('SPP', digest, projects)
                 logger.info(f"SPP: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"SPP failed: {e}")
@@ -435,7 +903,11 @@ class HybridPowerMonitor:
             logger.info(f"MISO: Fetching from JSON API")
             response = self.session.get(url, timeout=60)
             if response.status_code == 200:
-                data = response.json()
+                digest = hashlib.sha256(response.content).hexdigest()
+                cached = self.cached_projects('MISO', digest)
+                if cached is not None:
+                    return cached
+                data = json_loads(response.content)
                 logger.info(f"MISO: Found {len(data)} rows")
                 
                 for item in data:
@@ -458,6 +930,7 @@ class HybridPowerMonitor:
                         proj['hunter_score'] = self.calculate_hunter_score(proj)
                         proj['data_hash'] = self.generate_hash(proj)
                         projects.append(proj)
+                self.store_parsed('MISO', digest, projects)
                 logger.info(f"MISO: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"MISO failed: {e}")
@@ -473,30 +946,32 @@ class HybridPowerMonitor:
             return projects
         try:
             logger.info("ERCOT: Fetching via gridstatus.Ercot()")
-            ercot = gridstatus.Ercot()  # Note: lowercase 'e'!
-            df = ercot.get_interconnection_queue()
+            df = self.gridstatus_queue('Ercot')  # Note: lowercase 'e'!
             logger.info(f"ERCOT: Found {len(df)} rows")
             
-            for _, row in df.iterrows():
-                capacity = self.extract_capacity(row.get('Capacity (MW)') or row.get('Summer MW') or 0)
-                if capacity:
-                    data = {
-                        'request_id': f"ERCOT_{row.get('Queue ID', row.name)}",
-                        'project_name': str(row.get('Project Name', 'Unknown'))[:500],
-                        'capacity_mw': capacity,
-                        'county': str(row.get('County', ''))[:200],
-                        'state': 'TX',
-                        'customer': str(row.get('Interconnecting Entity', ''))[:500],
-                        'utility': 'ERCOT',
-                        'status': str(row.get('Status', 'Active')),
-                        'fuel_type': str(row.get('Fuel', row.get('Technology', ''))),
-                        'source': 'ERCOT',
-                        'source_url': 'gridstatus',
-                        'project_type': self.classify_project(str(row.get('Project Name', '')), str(row.get('Interconnecting Entity', '')), str(row.get('Fuel', '')))
-                    }
-                    data['hunter_score'] = self.calculate_hunter_score(data)
-                    data['data_hash'] = self.generate_hash(data)
-                    projects.append(data)
+            capacities = self.extract_capacities(coalesce_columns(df, ['Capacity (MW)', 'Summer MW']))
+            df, capacities = df[capacities.notna()], capacities.dropna()
+            project_types = self.classify_projects(text_column(df, 'Project Name'),
+                                                   text_column(df, 'Interconnecting Entity'),
+                                                   text_column(df, 'Fuel'))
+            for idx, row, capacity, project_type in zip(df.index, df.to_dict('records'), capacities.tolist(), project_types):
+                data = {
+                    'request_id': f"ERCOT_{row.get('Queue ID', idx)}",
+                    'project_name': str(row.get('Project Name', 'Unknown'))[:500],
+                    'capacity_mw': capacity,
+                    'county': str(row.get('County', ''))[:200],
+                    'state': 'TX',
+                    'customer': str(row.get('Interconnecting Entity', ''))[:500],
+                    'utility': 'ERCOT',
+                    'status': str(row.get('Status', 'Active')),
+                    'fuel_type': str(row.get('Fuel', row.get('Technology', ''))),
+                    'source': 'ERCOT',
+                    'source_url': 'gridstatus',
+                    'project_type': project_type
+                }
+                data['hunter_score'] = self.calculate_hunter_score(data)
+                data['data_hash'] = self.generate_hash(data)
+                projects.append(data)
             logger.info(f"ERCOT: Extracted {len(projects)} projects")
         except Exception as e:
             logger.error(f"ERCOT failed: {e}")
@@ -507,9 +982,10 @@ class HybridPowerMonitor:
     # =========================================================================
     def fetch_pjm(self):
         """PJM data from Berkeley Lab cache or fresh fetch"""
-        if 'PJM' in self.berkeley_lab_cache and self.berkeley_lab_cache['PJM']:
-            logger.info(f"PJM: Using cached data ({len(self.berkeley_lab_cache['PJM'])} projects)")
-            return self.berkeley_lab_cache['PJM']
+        if 'PJM' in self.berkeley_lab_cache:
+            projects = unpack_projects(self.berkeley_lab_cache['PJM'])
+            logger.info(f"PJM: Using cached data ({len(projects)} projects)")
+            return projects
         
         # Try to fetch Berkeley Lab data
         berkeley_projects = self.fetch_berkeley_lab()
@@ -517,7 +993,7 @@ class HybridPowerMonitor:
         # Extract PJM
         pjm_projects = [p for p in berkeley_projects if p.get('utility') == 'PJM']
         if pjm_projects:
-            self.berkeley_lab_cache['PJM'] = pjm_projects
+            self.berkeley_lab_cache['PJM'] = pack_projects(pjm_projects)
             logger.info(f"PJM: Got {len(pjm_projects)} projects from Berkeley Lab")
         else:
             logger.warning("PJM: No data available (Berkeley Lab fetch failed)")
@@ -567,31 +1043,34 @@ class HybridPowerMonitor:
         df = None
         successful_url = None
         
-        for url in urls_to_try:
+        for url in self.berkeley_lab_urls(urls_to_try, headers=header_sets[0]):
             for headers in header_sets:
                 try:
                     logger.info(f"Berkeley Lab: Trying {url}")
-                    response = self.session.get(url, headers=headers, timeout=120, allow_redirects=True)
+                    path = self.download_to_temp(url, '.xlsx', headers=headers, timeout=120, allow_redirects=True)
+                    if path is None:
+                        logger.debug(f"Berkeley Lab: No file at {url}")
+                        continue
                     
-                    # Check if we got actual Excel data
-                    if response.status_code == 200:
-                        content_type = response.headers.get('Content-Type', '')
-                        content_length = len(response.content)
+                    try:
+                        content_length = os.path.getsize(path)
+                        with open(path, 'rb') as f:
+                            magic = f.read(4)
                         
-                        # Excel files should be > 100KB and have right content type or magic bytes
+                        # Excel files should be > 100KB and have Excel magic bytes
                         if content_length > 100000:
-                            # Check for Excel magic bytes (PK for xlsx)
-                            if response.content[:2] == b'PK' or 'spreadsheet' in content_type or 'excel' in content_type:
-                                df = pd.read_excel(BytesIO(response.content), sheet_name=0)
+                            # PK for xlsx, OLE2 for legacy xls
+                            if magic[:2] == b'PK' or magic == b'\xd0\xcf\x11\xe0':
+                                df = pd.read_excel(path, sheet_name=0, engine=EXCEL_ENGINE)
                                 successful_url = url
                                 logger.info(f"Berkeley Lab: SUCCESS! Downloaded {content_length/1024/1024:.1f} MB from {url}")
                                 break
                             else:
-                                logger.debug(f"Berkeley Lab: Got response but not Excel (type: {content_type}, size: {content_length})")
+                                logger.debug(f"Berkeley Lab: Got response but not Excel (size: {content_length})")
                         else:
                             logger.debug(f"Berkeley Lab: Response too small ({content_length} bytes)")
-                    else:
-                        logger.debug(f"Berkeley Lab: HTTP {response.status_code} for {url}")
+                    finally:
+                        os.unlink(path)
                         
                 except Exception as e:
                     logger.debug(f"Berkeley Lab: Failed {url}: {e}")
@@ -600,6 +1079,9 @@ class HybridPowerMonitor:
             if df is not None:
                 break
         
+        if successful_url:
+            db.set_setting('berkeley_lab_url', successful_url)
+        
         # Strategy 2: Check for locally cached file
         if df is None:
             local_paths = [
@@ -611,7 +1093,7 @@ class HybridPowerMonitor:
             for path in local_paths:
                 if os.path.exists(path):
                     try:
-                        df = pd.read_excel(path, sheet_name=0)
+                        df = pd.read_excel(path, sheet_name=0, engine=EXCEL_ENGINE)
                         successful_url = f"file://{path}"
                         logger.info(f"Berkeley Lab: Loaded from local cache: {path}")
                         break
@@ -628,10 +1110,13 @@ class HybridPowerMonitor:
         logger.info(f"Berkeley Lab: Columns: {list(df.columns)[:10]}")
         
         # Find columns
+        # Lowercase the headers once; find_col runs nine times over them
+        lower_cols = [(str(col).lower(), col) for col in df.columns]
+        
         def find_col(names):
             for name in names:
-                for col in df.columns:
-                    if name.lower() in str(col).lower():
+                for lower, col in lower_cols:
+                    if name in lower:
                         return col
             return None
         
@@ -645,63 +1130,55 @@ class HybridPowerMonitor:
         fuel_col = find_col(['resource_type', 'resource', 'fuel', 'type', 'technology'])
         developer_col = find_col(['developer', 'interconnection', 'owner', 'applicant'])
         
-        for idx, row in df.iterrows():
+        capacities = self.first_capacity(df, [mw_col])
+        df, capacities = df[capacities.notna()], capacities.dropna()
+        project_types = self.classify_projects(text_column(df, name_col), text_column(df, developer_col),
+                                               text_column(df, fuel_col))
+        utilities = self.map_entities(df[entity_col] if entity_col else pd.Series('', index=df.index))
+        
+        def column(col, default):
+            """str() of each value in col, or default when no such column"""
+            return df[col].map(str).tolist() if col else [default] * len(df)
+        
+        ids = df[id_col].map(str).tolist() if id_col else df.index.map(str).tolist()
+        fields = [column(col, default) for col, default in [
+            (name_col, 'Unknown'), (county_col, ''), (state_col, ''), (developer_col, ''),
+            (status_col, 'Active'), (fuel_col, '')]]
+        skipped = 0
+        for queue_id, name, county, state, customer, status, fuel, capacity, utility, project_type in zip(
+                ids, *fields, capacities.tolist(), utilities, project_types):
             try:
-                entity = str(row.get(entity_col, '') if entity_col else '').upper()
-                
-                # Map entity to utility name
-                if 'PJM' in entity:
-                    utility = 'PJM'
-                elif 'MISO' in entity:
-                    utility = 'MISO'
-                elif 'CAISO' in entity or 'CALIFORNIA' in entity:
-                    utility = 'CAISO'
-                elif 'ERCOT' in entity or 'TEXAS' in entity:
-                    utility = 'ERCOT'
-                elif 'SPP' in entity:
-                    utility = 'SPP'
-                elif 'NYISO' in entity or 'NEW YORK' in entity:
-                    utility = 'NYISO'
-                elif 'ISO-NE' in entity or 'ISONE' in entity or 'NEW ENGLAND' in entity:
-                    utility = 'ISO-NE'
-                else:
-                    utility = entity[:20] if entity else 'Other'
-                
-                capacity = self.extract_capacity(row.get(mw_col, 0) if mw_col else 0)
-                if not capacity:
-                    continue
-                
                 proj = {
-                    'request_id': f"{utility}_BL_{row.get(id_col, idx) if id_col else idx}",
-                    'project_name': str(row.get(name_col, 'Unknown') if name_col else 'Unknown')[:500],
+                    'request_id': f"{utility}_BL_{queue_id}",
+                    'project_name': name[:500],
                     'capacity_mw': capacity,
-                    'county': str(row.get(county_col, '') if county_col else '')[:200],
-                    'state': str(row.get(state_col, '') if state_col else '')[:2],
-                    'customer': str(row.get(developer_col, '') if developer_col else '')[:500],
+                    'county': county[:200],
+                    'state': state[:2],
+                    'customer': customer[:500],
                     'utility': utility,
-                    'status': str(row.get(status_col, 'Active') if status_col else 'Active'),
-                    'fuel_type': str(row.get(fuel_col, '') if fuel_col else ''),
+                    'status': status,
+                    'fuel_type': fuel,
                     'source': f'{utility} (Berkeley Lab)',
                     'source_url': successful_url,
-                    'project_type': self.classify_project(
-                        str(row.get(name_col, '') if name_col else ''),
-                        str(row.get(developer_col, '') if developer_col else ''),
-                        str(row.get(fuel_col, '') if fuel_col else '')
-                    )
+                    'project_type': project_type
                 }
                 proj['hunter_score'] = self.calculate_hunter_score(proj)
                 proj['data_hash'] = self.generate_hash(proj)
                 projects.append(proj)
                 
-            except Exception as e:
+            except (KeyError, ValueError, TypeError) as e:
+                skipped += 1
+                logger.debug(f"Berkeley Lab: Bad row {queue_id}: {e}")
                 continue
+        if skipped:
+            logger.warning(f"Berkeley Lab: Skipped {skipped} malformed rows")
         
         # Cache by utility
+        by_utility = {}
         for proj in projects:
-            utility = proj.get('utility', 'Other')
-            if utility not in self.berkeley_lab_cache:
-                self.berkeley_lab_cache[utility] = []
-            self.berkeley_lab_cache[utility].append(proj)
+            by_utility.setdefault(proj.get('utility', 'Other'), []).append(proj)
+        for utility, utility_projects in by_utility.items():
+            self.berkeley_lab_cache[utility] = pack_projects(utility_projects)
         
         logger.info(f"Berkeley Lab: Extracted {len(projects)} total projects")
         
@@ -717,6 +1194,30 @@ class HybridPowerMonitor:
     # =========================================================================
     # Main Run
     # =========================================================================
+    # projects columns written by a scan, in upsert parameter order
+    STORED_COLUMNS = [
+        'request_id', 'project_name', 'capacity_mw', 'county', 'state', 'customer',
+        'utility', 'status', 'fuel_type', 'source', 'source_url', 'project_type',
+        'hunter_score', 'data_hash',
+    ]
+
+    # One constant statement text, so each sync's executemany reuses the
+    # compiled statement from the connection's cache
+    UPSERT_SQL = '''
+        INSERT INTO projects (request_id, project_name, capacity_mw, county, state,
+            customer, utility, status, fuel_type, source, source_url, project_type,
+            hunter_score, data_hash, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(request_id) DO UPDATE SET
+            project_name=excluded.project_name, capacity_mw=excluded.capacity_mw,
+            county=excluded.county, state=excluded.state, customer=excluded.customer,
+            utility=excluded.utility, status=excluded.status, fuel_type=excluded.fuel_type,
+            source=excluded.source, source_url=excluded.source_url,
+            project_type=excluded.project_type, hunter_score=excluded.hunter_score,
+            data_hash=excluded.data_hash, content_hash=excluded.content_hash,
+            last_updated=CURRENT_TIMESTAMP
+    '''
+    
     def run_comprehensive_monitoring(self):
         """Run all monitors and store results"""
         start_time = time.time()
@@ -733,71 +1234,76 @@ class HybridPowerMonitor:
         
         all_projects = []
         stats = {}
+        sync_rows = []  # (source, projects_found, status, error), written with the projects
         
-        for source_name, fetch_func in monitors:
-            try:
+        # The fetchers spend most of their time waiting on downloads, so run them
+        # side by side; results are still collected in the order above
+        with ThreadPoolExecutor(max_workers=len(monitors)) as pool:
+            futures = []
+            for source_name, fetch_func in monitors:
                 logger.info(f"Fetching {source_name}...")
-                projects = fetch_func()
+                futures.append((source_name, pool.submit(fetch_func)))
+        
+        for source_name, future in futures:
+            try:
+                projects = future.result()
                 all_projects.extend(projects)
                 stats[source_name] = len(projects)
                 logger.info(f"{source_name}: {len(projects)} projects")
-                
-                db.execute('''
-                    INSERT INTO sync_log (source, projects_found, projects_new, status)
-                    VALUES (?, ?, 0, 'success')
-                ''', (source_name, len(projects)))
+                sync_rows.append((source_name, len(projects), 'success', None))
                 
             except Exception as e:
                 logger.error(f"{source_name} failed: {e}")
                 stats[source_name] = 0
-                db.execute('''
-                    INSERT INTO sync_log (source, projects_found, projects_new, status, error_message)
-                    VALUES (?, 0, 0, 'error', ?)
-                ''', (source_name, str(e)))
+                sync_rows.append((source_name, 0, 'error', str(e)))
         
-        # Store projects
-        new_count = 0
-        for project in all_projects:
+        # Store projects - one upsert on the request_id unique index, committed
+        # once, instead of a SELECT + UPDATE/INSERT and a commit per project.
+        # Each stored row's content hash is loaded up front in a single query,
+        # so unchanged projects skip the write.
+        known = {row['request_id']: row['content_hash']
+                 for row in db.fetchall('SELECT request_id, content_hash FROM projects')}
+        # Upsert rows straight from one frame: missing fields are filled
+        # column-wise rather than looked up project by project
+        latest = {}
+        if all_projects:
+            df = pd.DataFrame(all_projects).reindex(columns=self.STORED_COLUMNS)
+            optional = [c for c in self.STORED_COLUMNS if c not in ('capacity_mw', 'hunter_score')]
+            df[optional] = df[optional].fillna('')
+            df['hunter_score'] = df['hunter_score'].fillna(0).astype(int)
+            # Later duplicates of a request_id win, as with every row upserted
+            latest = {row[0]: row + (content_hash(row),) for row in df.itertuples(index=False, name=None)}
+        new_count = len(latest.keys() - known.keys())
+        rows = [row for request_id, row in latest.items() if known.get(request_id) != row[-1]]
+        logger.info(f"{len(rows)} of {len(latest)} projects new or changed")
+        # The projects, sync log and run record go out in one transaction and
+        # one commit; a SAVEPOINT lets a failed store roll back on its own
+        # while the run is still logged
+        with db.transaction() as conn:
+            conn.execute('BEGIN')
+            conn.execute('SAVEPOINT store_projects')
             try:
-                existing = db.fetchone('SELECT id FROM projects WHERE request_id = ?', (project['request_id'],))
-                if existing:
-                    db.execute('''
-                        UPDATE projects SET
-                            project_name=?, capacity_mw=?, county=?, state=?, customer=?,
-                            utility=?, status=?, fuel_type=?, source=?, source_url=?,
-                            project_type=?, hunter_score=?, data_hash=?, last_updated=CURRENT_TIMESTAMP
-                        WHERE request_id=?
-                    ''', (
-                        project['project_name'], project['capacity_mw'], project.get('county', ''),
-                        project.get('state', ''), project.get('customer', ''), project['utility'],
-                        project.get('status', ''), project.get('fuel_type', ''), project['source'],
-                        project.get('source_url', ''), project.get('project_type', ''),
-                        project.get('hunter_score', 0), project['data_hash'], project['request_id']
-                    ))
-                else:
-                    db.execute('''
-                        INSERT INTO projects (request_id, project_name, capacity_mw, county, state,
-                            customer, utility, status, fuel_type, source, source_url, project_type,
-                            hunter_score, data_hash)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        project['request_id'], project['project_name'], project['capacity_mw'],
-                        project.get('county', ''), project.get('state', ''), project.get('customer', ''),
-                        project['utility'], project.get('status', ''), project.get('fuel_type', ''),
-                        project['source'], project.get('source_url', ''), project.get('project_type', ''),
-                        project.get('hunter_score', 0), project['data_hash']
-                    ))
-                    new_count += 1
-            except Exception as e:
-                logger.debug(f"Failed to store project: {e}")
-        
-        duration = time.time() - start_time
-        
-        # Log run
-        db.execute('''
-            INSERT INTO monitor_runs (status, sources_checked, projects_found, projects_stored, duration_seconds, details)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', ('success', len(monitors), len(all_projects), new_count, duration, json.dumps(stats)))
+                conn.executemany(self.UPSERT_SQL, rows)
+                conn.executemany('''
+                    INSERT INTO sync_log (source, projects_found, projects_new, status, error_message)
+                    VALUES (?, ?, 0, ?, ?)
+                ''', sync_rows)
+                if rows:
+                    # Refresh the planner's statistics for the new table contents
+                    conn.execute('ANALYZE projects')
+            except sqlite3.Error as e:
+                logger.error(f"Failed to store projects: {e}")
+                conn.execute('ROLLBACK TO store_projects')
+                new_count = 0
+            conn.execute('RELEASE store_projects')
+            
+            duration = time.time() - start_time
+            
+            # Log run
+            conn.execute('''
+                INSERT INTO monitor_runs (status, sources_checked, projects_found, projects_stored, duration_seconds, details)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', ('success', len(monitors), len(all_projects), new_count, duration, json.dumps(stats)))
         
         logger.info(f"Monitoring complete: {len(all_projects)} projects, {new_count} new, {duration:.1f}s")
         
@@ -812,16 +1318,190 @@ class HybridPowerMonitor:
 # Initialize monitor
 monitor = HybridPowerMonitor(min_capacity_mw=100)
 
+# Manual and API syncs run in a separate scan process: requests return at
+# once, and the pandas parsing does not compete with the web threads for the
+# GIL. Jobs are rows in scan_jobs, so every gunicorn worker and the scheduler
+# see the same queue and at most one scan is pending across all of them.
+def init_scan_worker():
+    """Set up the scan process.
+
+    spawn starts it from a fresh import of this module, so it builds its own
+    SQLite connections, HTTP session and monitor instead of inheriting the
+    web process's. Stopping is left to the process that owns it: a scan in
+    progress ignores SIGTERM and runs until it finishes or is killed.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+def create_scan_executor():
+    # spawn, not fork: forking the threaded web server can copy a lock held by
+    # another thread into the child and deadlock it
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=init_scan_worker)
+
+
+scan_executor = create_scan_executor()
+MAX_SCAN_JOBS = 20
+# A job still queued or running after this long belongs to a process that
+# died mid-scan, and no longer blocks new ones
+SCAN_STALE_SECONDS = 3 * 3600
+
+
+def start_scan():
+    """Queue a monitoring run; (job_id, True) if queued, else (pending job_id, False)"""
+    global scan_executor
+    with db.transaction() as conn:
+        # Takes the write lock up front, so two processes cannot both find no
+        # pending job and queue one each
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('''
+            UPDATE scan_jobs SET status = 'failed', finished_at = CURRENT_TIMESTAMP,
+                                 error = 'Abandoned: the process running it stopped'
+            WHERE status IN ('queued', 'running')
+              AND COALESCE(started_at, created_at) < datetime('now', ?)
+        ''', (f'-{SCAN_STALE_SECONDS} seconds',))
+        pending = conn.execute(
+            "SELECT id FROM scan_jobs WHERE status IN ('queued', 'running')").fetchone()
+        if pending:
+            return pending['id'], False
+        job_id = uuid.uuid4().hex
+        conn.execute("INSERT INTO scan_jobs (id, status) VALUES (?, 'queued')", (job_id,))
+        # Forget the oldest finished jobs
+        conn.execute('''
+            DELETE FROM scan_jobs WHERE id NOT IN (
+                SELECT id FROM scan_jobs ORDER BY created_at DESC, rowid DESC LIMIT ?)
+        ''', (MAX_SCAN_JOBS,))
+    try:
+        future = scan_executor.submit(run_scan_job, job_id)
+    except BrokenProcessPool:
+        logger.warning("Scan process died, starting a new one")
+        scan_executor = create_scan_executor()
+        future = scan_executor.submit(run_scan_job, job_id)
+    future.add_done_callback(lambda f: scan_job_done(job_id, f))
+    return job_id, True
+
+
+def scan_job_done(job_id, future):
+    """Fail a job whose scan process died before it could record an outcome"""
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Sync {job_id} lost its scan process: {error}")
+        db.execute('''
+            UPDATE scan_jobs SET status = 'failed', finished_at = CURRENT_TIMESTAMP, error = ?
+            WHERE id = ? AND status IN ('queued', 'running')
+        ''', (str(error) or type(error).__name__, job_id))
+
+
+def run_scan_job(job_id):
+    """Run a queued scan, recording its progress and outcome in scan_jobs"""
+    db.execute("UPDATE scan_jobs SET status = 'running', started_at = CURRENT_TIMESTAMP WHERE id = ?",
+               (job_id,))
+    try:
+        result = monitor.run_comprehensive_monitoring()
+    except Exception as e:
+        logger.error(f"Sync {job_id} failed: {e}")
+        db.execute('''
+            UPDATE scan_jobs SET status = 'failed', finished_at = CURRENT_TIMESTAMP, error = ?
+            WHERE id = ?
+        ''', (str(e), job_id))
+        return
+    db.execute('''
+        UPDATE scan_jobs SET status = 'finished', finished_at = CURRENT_TIMESTAMP, result = ?
+        WHERE id = ?
+    ''', (json.dumps(result), job_id))
+
 
 # =============================================================================
 # Flask Routes
 # =============================================================================
 
-@app.route('/')
-def index():
-    """Dashboard home"""
-    total = db.fetchone('SELECT COUNT(*) as count FROM projects')['count']
-    total_mw = db.fetchone('SELECT SUM(capacity_mw) as total FROM projects')['total'] or 0
+# Keyset pagination over ORDER BY hunter_score DESC, capacity_mw DESC, id: a
+# page resumes after the previous page's last (score, mw, id) so deep pages
+# are an index range scan, not an OFFSET skip
+KEYSET_CLAUSE = '''hunter_score <= ?
+    AND (hunter_score < ? OR capacity_mw < ? OR (capacity_mw = ? AND id > ?))'''
+
+
+def cursor_for(row):
+    return f"{row['hunter_score']},{row['capacity_mw']},{row['id']}"
+
+
+def parse_cursor(value):
+    """(score, mw, id) from an "after" cursor, or None if absent or malformed"""
+    try:
+        after_score, after_mw, after_id = value.split(',')
+        return int(after_score), float(after_mw), int(after_id)
+    except ValueError:
+        return None
+
+
+def keyset_params(after):
+    score, mw, row_id = after
+    return [score, score, mw, mw, row_id]
+
+
+class Pagination:
+    """The subset of Flask-SQLAlchemy's Pagination the templates use"""
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.pages = (total + per_page - 1) // per_page
+        self.has_prev = page > 1
+        self.has_next = page < self.pages
+        self.prev_num = page - 1
+        self.next_num = page + 1
+        # Keyset cursor for the page after this one
+        self.next_cursor = None
+        if items:
+            self.next_cursor = cursor_for(items[-1])
+
+
+def scan_epoch():
+    """Id of the latest monitor run, the cache key for per-scan aggregates"""
+    return db.fetchone('SELECT MAX(id) as id FROM monitor_runs')['id'] or 0
+
+
+@lru_cache(maxsize=64)
+def count_projects(scan_epoch, where_clause, params):
+    """Projects matching a /projects filter as of scan_epoch.
+
+    Paging through one filter reuses its count instead of recounting the
+    filtered set on every page.
+    """
+    return db.fetchone(f'SELECT COUNT(*) as count FROM projects WHERE {where_clause}', params)['count']
+
+
+@lru_cache(maxsize=1)
+def project_states(scan_epoch):
+    """States with projects as of scan_epoch, for the /projects filter"""
+    return [r['state'] for r in db.fetchall('SELECT DISTINCT state FROM projects WHERE state != "" ORDER BY state')]
+
+
+@lru_cache(maxsize=1)
+def source_stats(scan_epoch):
+    """Per-source last sync and totals as of scan_epoch; sync_log is only
+    written by a scan, in the same commit as its monitor run"""
+    return [dict(row) for row in db.fetchall('''
+        SELECT source, MAX(sync_time) as last_sync, SUM(projects_found) as total_found
+        FROM sync_log GROUP BY source
+    ''')]
+
+
+@lru_cache(maxsize=1)
+def dashboard_stats(scan_epoch):
+    """Dashboard aggregates as of scan_epoch, the id of the latest monitor run.
+
+    Projects are only written by a scan, which records its monitor run in the
+    same commit, so these are recomputed once per scan instead of per visit.
+    """
+    # Headline numbers in one table scan instead of three
+    totals = db.fetchone('''
+        SELECT COUNT(*) as count, SUM(capacity_mw) as total_mw,
+               SUM(CASE WHEN hunter_score >= 60 THEN 1 ELSE 0 END) as high_score
+        FROM projects
+    ''')
     
     by_utility = db.fetchall('''
         SELECT utility, COUNT(*) as count, SUM(capacity_mw) as total_mw
@@ -833,22 +1513,32 @@ def index():
         FROM projects GROUP BY project_type ORDER BY count DESC
     ''')
     
-    high_score = db.fetchone('SELECT COUNT(*) as count FROM projects WHERE hunter_score >= 60')['count']
     recent = db.fetchall('''
-        SELECT * FROM projects ORDER BY first_seen DESC LIMIT 10
+        SELECT id, project_name, state, capacity_mw, utility, hunter_score
+        FROM projects ORDER BY first_seen DESC LIMIT 10
     ''')
     
-    last_run = db.fetchone('SELECT * FROM monitor_runs ORDER BY run_date DESC LIMIT 1')
+    return {
+        'total': totals['count'],
+        'total_mw': totals['total_mw'] or 0,
+        'high_score': totals['high_score'] or 0,
+        'by_utility': [dict(row) for row in by_utility],
+        'by_type': [dict(row) for row in by_type],
+        'recent': [dict(row) for row in recent],
+    }
+
+
+@app.route('/')
+def index():
+    """Dashboard home"""
+    # Only what the page shows, not the run's details JSON
+    last_run = db.fetchone('SELECT id, run_date, projects_found FROM monitor_runs ORDER BY run_date DESC LIMIT 1')
+    stats = dashboard_stats(last_run['id'] if last_run else 0)
     
     return render_template('index.html',
-        total=total,
-        total_mw=total_mw,
-        by_utility=by_utility,
-        by_type=by_type,
-        high_score=high_score,
-        recent=recent,
         last_run=last_run,
-        gridstatus_available=GRIDSTATUS_AVAILABLE
+        gridstatus_available=GRIDSTATUS_AVAILABLE,
+        **stats
     )
 
 
@@ -882,38 +1572,38 @@ def projects():
         params.append(min_capacity)
     
     if search:
-        conditions.append('(project_name LIKE ? OR customer LIKE ? OR county LIKE ?)')
-        params.extend([f'%{search}%'] * 3)
+        # The trigram index finds substrings of 3+ characters without scanning
+        # the table; shorter terms, or ones using LIKE wildcards, still use LIKE
+        if db.search_index and len(search) >= 3 and not any(c in search for c in '%_'):
+            conditions.append('id IN (SELECT rowid FROM projects_search WHERE projects_search MATCH ?)')
+            params.append('"' + search.replace('"', '""') + '"')
+        else:
+            conditions.append('(project_name LIKE ? OR customer LIKE ? OR county LIKE ?)')
+            params.extend([f'%{search}%'] * 3)
     
     where_clause = ' AND '.join(conditions) if conditions else '1=1'
     
     # Get total count
-    total = db.fetchone(f'SELECT COUNT(*) as count FROM projects WHERE {where_clause}', params)['count']
+    total = count_projects(scan_epoch(), where_clause, tuple(params))
     
-    # Get paginated results
-    offset = (page - 1) * per_page
-    query_params = params + [per_page, offset]
+    # Get paginated results; "Next" links carry a keyset cursor
+    after = parse_cursor(request.args.get('after', ''))
+    if after:
+        page_clause = f'{where_clause} AND {KEYSET_CLAUSE}'
+        query_params = params + keyset_params(after) + [per_page, 0]
+    else:
+        page_clause = where_clause
+        query_params = params + [per_page, (page - 1) * per_page]
     items = db.fetchall(f'''
-        SELECT * FROM projects WHERE {where_clause}
-        ORDER BY hunter_score DESC, capacity_mw DESC
+        SELECT id, request_id, project_name, capacity_mw, county, state, customer,
+               utility, status, fuel_type, project_type, hunter_score
+        FROM projects WHERE {page_clause}
+        ORDER BY hunter_score DESC, capacity_mw DESC, id
         LIMIT ? OFFSET ?
     ''', query_params)
     
     # Get states for filter
-    states = [r['state'] for r in db.fetchall('SELECT DISTINCT state FROM projects WHERE state != "" ORDER BY state')]
-    
-    # Create pagination object
-    class Pagination:
-        def __init__(self, items, page, per_page, total):
-            self.items = items
-            self.page = page
-            self.per_page = per_page
-            self.total = total
-            self.pages = (total + per_page - 1) // per_page
-            self.has_prev = page > 1
-            self.has_next = page < self.pages
-            self.prev_num = page - 1
-            self.next_num = page + 1
+    states = project_states(scan_epoch())
     
     pagination = Pagination(items, page, per_page, total)
     
@@ -930,21 +1620,31 @@ def projects():
 @app.route('/project/<int:id>')
 def project_detail(id):
     """Single project detail"""
-    project = db.fetchone('SELECT * FROM projects WHERE id = ?', (id,))
+    project = db.fetchone('''
+        SELECT id, request_id, project_name, capacity_mw, county, state, customer, utility,
+               status, fuel_type, source, project_type, hunter_score, first_seen, last_updated
+        FROM projects WHERE id = ?
+    ''', (id,))
     if not project:
         return redirect(url_for('projects'))
     return render_template('project_detail.html', project=project)
 
 
-@app.route('/analytics')
-def analytics():
-    """Analytics dashboard"""
-    # Score distribution
-    high = db.fetchone('SELECT COUNT(*) as count FROM projects WHERE hunter_score >= 70')['count']
-    medium = db.fetchone('SELECT COUNT(*) as count FROM projects WHERE hunter_score >= 40 AND hunter_score < 70')['count']
-    low = db.fetchone('SELECT COUNT(*) as count FROM projects WHERE hunter_score < 40')['count']
+@lru_cache(maxsize=1)
+def analytics_stats(scan_epoch, today):
+    """/analytics aggregates as of scan_epoch, cached like dashboard_stats.
+
+    today is part of the key because the timeline window moves with the date.
+    """
+    # Score distribution in one scan of the score index instead of three counts
+    bands = db.fetchone('''
+        SELECT SUM(CASE WHEN hunter_score >= 70 THEN 1 ELSE 0 END) as high,
+               SUM(CASE WHEN hunter_score >= 40 AND hunter_score < 70 THEN 1 ELSE 0 END) as medium,
+               SUM(CASE WHEN hunter_score < 40 THEN 1 ELSE 0 END) as low
+        FROM projects
+    ''')
     
-    score_distribution = {'high': high, 'medium': medium, 'low': low}
+    score_distribution = {band: bands[band] or 0 for band in ('high', 'medium', 'low')}
     
     # State stats
     state_stats = db.fetchall('''
@@ -966,30 +1666,38 @@ def analytics():
         GROUP BY DATE(first_seen) ORDER BY date
     ''')
     
-    return render_template('analytics.html',
-        score_distribution=score_distribution,
-        state_stats=state_stats,
-        hotspot_stats=hotspot_stats,
-        timeline=timeline
-    )
+    return {
+        'score_distribution': score_distribution,
+        'state_stats': [dict(row) for row in state_stats],
+        'hotspot_stats': [dict(row) for row in hotspot_stats],
+        'timeline': [dict(row) for row in timeline],
+    }
+
+
+@app.route('/analytics')
+def analytics():
+    """Analytics dashboard"""
+    # DATE('now') is UTC, as is the timeline's window
+    stats = analytics_stats(scan_epoch(), datetime.utcnow().date())
+    
+    return render_template('analytics.html', **stats)
 
 
 @app.route('/monitoring')
 def monitoring():
     """System monitoring page"""
-    runs = db.fetchall('SELECT * FROM monitor_runs ORDER BY run_date DESC LIMIT 20')
-    source_stats = db.fetchall('''
-        SELECT source, MAX(sync_time) as last_sync, SUM(projects_found) as total_found
-        FROM sync_log GROUP BY source
+    runs = db.fetchall('''
+        SELECT run_date, status, sources_checked, projects_found, projects_stored, duration_seconds
+        FROM monitor_runs ORDER BY run_date DESC LIMIT 20
     ''')
     
-    return render_template('monitoring.html', runs=runs, source_stats=source_stats)
+    return render_template('monitoring.html', runs=runs, source_stats=source_stats(scan_epoch()))
 
 
 @app.route('/alerts', methods=['GET', 'POST'])
 def alerts():
     """Alert subscriptions"""
-    subscriptions = db.fetchall('SELECT * FROM alert_subscriptions WHERE active = 1')
+    subscriptions = db.fetchall('SELECT email, min_capacity, states FROM alert_subscriptions WHERE active = 1')
     return render_template('alerts.html', subscriptions=subscriptions)
 
 
@@ -1013,46 +1721,63 @@ def subscribe_alerts():
 
 @app.route('/trigger')
 def trigger_monitor():
-    """Trigger manual sync"""
-    result = monitor.run_comprehensive_monitoring()
+    """Trigger manual sync in the background"""
+    job_id, created = start_scan()
+    if created:
+        logger.info(f"Manual sync queued as job {job_id}")
+    else:
+        logger.info(f"Sync {job_id} already pending")
     return redirect(url_for('monitoring'))
 
 
+@app.route('/trigger/<job_id>')
+@app.route('/api/sync/<job_id>')
+def trigger_status(job_id):
+    """Status of a queued manual or API sync"""
+    job = db.fetchone('SELECT status, result, error FROM scan_jobs WHERE id = ?', (job_id,))
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['status'] == 'failed':
+        return jsonify({'job_id': job_id, 'status': 'failed', 'error': job['error']})
+    if job['status'] == 'finished':
+        return jsonify({'job_id': job_id, 'status': 'finished', 'result': json_loads(job['result'])})
+    return jsonify({'job_id': job_id, 'status': job['status']})
+
+
+# Rows per chunk of a streamed CSV export
+EXPORT_BLOCK_ROWS = 1000
+
+
 @app.route('/export')
 def export_csv():
     """Export projects to CSV"""
     min_score = request.args.get('min_score', 0, type=int)
     
-    projects = db.fetchall('''
+    projects = db.iterate('''
         SELECT request_id, project_name, capacity_mw, county, state, customer,
                utility, status, fuel_type, project_type, hunter_score, first_seen
         FROM projects WHERE hunter_score >= ?
         ORDER BY hunter_score DESC, capacity_mw DESC
     ''', (min_score,))
     
-    # Build CSV
-    lines = ['Request ID,Project Name,Capacity MW,County,State,Customer,Utility,Status,Fuel Type,Type,Score,First Seen']
-    for p in projects:
-        line = ','.join([
-            f'"{p["request_id"]}"',
-            f'"{(p["project_name"] or "").replace(chr(34), chr(39))}"',
-            str(p['capacity_mw']),
-            f'"{p["county"] or ""}"',
-            f'"{p["state"] or ""}"',
-            f'"{(p["customer"] or "").replace(chr(34), chr(39))}"',
-            f'"{p["utility"]}"',
-            f'"{p["status"] or ""}"',
-            f'"{p["fuel_type"] or ""}"',
-            f'"{p["project_type"] or ""}"',
-            str(p['hunter_score']),
-            f'"{p["first_seen"]}"'
-        ])
-        lines.append(line)
-    
-    csv_content = '\n'.join(lines)
+    # Stream the CSV a block of rows at a time, so neither the result set nor
+    # the whole file is ever held in memory. csv.writer formats each block in
+    # C: text quoted with embedded quotes doubled, numbers bare, NULLs as "".
+    def generate():
+        yield 'Request ID,Project Name,Capacity MW,County,State,Customer,Utility,Status,Fuel Type,Type,Score,First Seen\n'
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator='\n')
+        while True:
+            rows = projects.fetchmany(EXPORT_BLOCK_ROWS)
+            if not rows:
+                break
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
     
     return Response(
-        csv_content,
+        generate(),
         mimetype='text/csv',
         headers={'Content-Disposition': f'attachment; filename=power_projects_{datetime.now().strftime("%Y%m%d")}.csv'}
     )
@@ -1062,9 +1787,9 @@ def export_csv():
 # API Routes
 # =============================================================================
 
-@app.route('/api/stats')
-def api_stats():
-    """API: Get statistics"""
+@lru_cache(maxsize=1)
+def api_stats_data(scan_epoch):
+    """/api/stats aggregates as of scan_epoch, cached like dashboard_stats"""
     total = db.fetchone('SELECT COUNT(*) as count FROM projects')['count']
     by_utility = [dict(r) for r in db.fetchall('''
         SELECT utility, COUNT(*) as count, SUM(capacity_mw) as total_mw
@@ -1073,13 +1798,13 @@ def api_stats():
     by_state = [dict(r) for r in db.fetchall('''
         SELECT state, COUNT(*) as count FROM projects WHERE state != '' GROUP BY state
     ''')]
-    
-    return jsonify({
-        'total_projects': total,
-        'by_utility': by_utility,
-        'by_state': by_state,
-        'gridstatus_available': GRIDSTATUS_AVAILABLE
-    })
+    return {'total_projects': total, 'by_utility': by_utility, 'by_state': by_state}
+
+
+@app.route('/api/stats')
+def api_stats():
+    """API: Get statistics"""
+    return jsonify({**api_stats_data(scan_epoch()), 'gridstatus_available': GRIDSTATUS_AVAILABLE})
 
 
 @app.route('/api/projects')
@@ -1089,20 +1814,40 @@ def api_projects():
     offset = request.args.get('offset', 0, type=int)
     min_score = request.args.get('min_score', 0, type=int)
     
-    projects = db.fetchall('''
-        SELECT * FROM projects WHERE hunter_score >= ?
-        ORDER BY hunter_score DESC, capacity_mw DESC
+    # ?after=<X-Next-Cursor of the previous response> pages without OFFSET
+    where_clause = 'hunter_score >= ?'
+    params = [min_score]
+    after = parse_cursor(request.args.get('after', ''))
+    if after:
+        where_clause += f' AND {KEYSET_CLAUSE}'
+        params += keyset_params(after)
+        offset = 0
+    
+    # Named columns: content_hash is internal bookkeeping and not JSON-serializable
+    projects = db.fetchall(f'''
+        SELECT id, request_id, project_name, capacity_mw, county, state, customer, utility,
+               status, fuel_type, source, source_url, project_type, hunter_score, data_hash,
+               first_seen, last_updated
+        FROM projects WHERE {where_clause}
+        ORDER BY hunter_score DESC, capacity_mw DESC, id
         LIMIT ? OFFSET ?
-    ''', (min_score, limit, offset))
+    ''', params + [limit, offset])
     
-    return jsonify([dict(p) for p in projects])
+    response = jsonify([dict(p) for p in projects])
+    if projects:
+        response.headers['X-Next-Cursor'] = cursor_for(projects[-1])
+    return response
 
 
 @app.route('/api/sync', methods=['POST'])
 def api_sync():
-    """API: Trigger sync"""
-    result = monitor.run_comprehensive_monitoring()
-    return jsonify(result)
+    """API: Queue a sync and return 202 with its job id, or 409 if one is pending"""
+    # Goes through start_scan so it can never overlap a /trigger scan
+    job_id, created = start_scan()
+    if not created:
+        return jsonify({'status': 'busy', 'job_id': job_id}), 409
+    return jsonify({'status': 'queued', 'job_id': job_id,
+                    'status_url': url_for('trigger_status', job_id=job_id)}), 202
 
 
 # =============================================================================
@@ -1112,20 +1857,26 @@ def api_sync():
 def init_app():
     """Initialize application"""
     os.makedirs(DATA_DIR, exist_ok=True)
-    logger.info(f"Power Monitor starting. gridstatus: {GRIDSTATUS_AVAILABLE}")
-    
-    # Check if we need initial sync
+    logger.info(f"Power Monitor starting. gridstatus: {GRIDSTATUS_AVAILABLE}, excel engine: {EXCEL_ENGINE}")
+
+
+def sync_if_empty():
+    """Queue the first sync when the database has no projects yet"""
     count = db.fetchone('SELECT COUNT(*) as count FROM projects')['count']
     if count == 0:
-        logger.info("No projects in database, running initial sync...")
-        try:
-            monitor.run_comprehensive_monitoring()
-        except Exception as e:
-            logger.error(f"Initial sync failed: {e}")
+        # In the background, so the app can serve requests while the first
+        # sync downloads every queue
+        job_id, _ = start_scan()
+        logger.info(f"No projects in database, initial sync queued as job {job_id}")
 
 
 init_app()
 
 
 if __name__ == '__main__':
+    # Never at import: under gunicorn the worker process (Procfile) runs the
+    # first scan. The debug reloader runs this block in both its watcher and
+    # the serving child; only the child, which sets WERKZEUG_RUN_MAIN, syncs.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        sync_if_empty()
     app.run(host='0.0.0.0', port=8080, debug=True)
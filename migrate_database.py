@@ -8,6 +8,9 @@ import os
 import sys
 from datetime import datetime
 
+# Score updates are flushed this many at a time, all in one commit
+BACKFILL_CHUNK_SIZE = 10000
+
 # Fix Railway PostgreSQL URL
 if 'DATABASE_URL' in os.environ:
     if os.environ['DATABASE_URL'].startswith('postgres://'):
@@ -20,6 +23,14 @@ from flask_sqlalchemy import SQLAlchemy
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///local.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# psycopg2 sends the backfill's bulk UPDATEs as execute_batch pages rather
+# than one statement per row. The options are psycopg2's own (the default
+# driver for postgresql://); other drivers such as pg8000 reject them.
+if app.config['SQLALCHEMY_DATABASE_URI'].startswith(('postgresql://', 'postgresql+psycopg2://')):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'executemany_mode': 'values_plus_batch',
+        'executemany_batch_page_size': 500,
+    }
 
 db = SQLAlchemy(app)
 
@@ -90,6 +101,7 @@ def backfill_scores():
         print(f"Found {len(projects)} projects to score...")
         
         updated = 0
+        pending = []
         for project in projects:
             # Build project data dict
             project_data = {
@@ -105,19 +117,27 @@ def backfill_scores():
             score_result = monitor.calculate_hunter_score(project_data)
             
             # Update project
-            project.hunter_score = score_result['hunter_score']
-            project.hunter_notes = score_result['hunter_notes']
+            changes = {
+                'id': project.id,
+                'hunter_score': score_result['hunter_score'],
+                'hunter_notes': score_result['hunter_notes'],
+            }
             
             # Update type if high confidence data center
             if score_result['hunter_score'] >= 60:
-                project.project_type = 'datacenter'
+                changes['project_type'] = 'datacenter'
             
+            pending.append(changes)
             updated += 1
             
-            if updated % 100 == 0:
+            if len(pending) >= BACKFILL_CHUNK_SIZE:
+                db.session.bulk_update_mappings(PowerProject, pending)
+                db.session.flush()
+                pending = []
                 print(f"  Processed {updated} projects...")
-                db.session.commit()
         
+        if pending:
+            db.session.bulk_update_mappings(PowerProject, pending)
         db.session.commit()
         
         print(f"\n✅ Updated {updated} projects with hunter scores")
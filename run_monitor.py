@@ -13,6 +13,8 @@ from io import BytesIO, StringIO
 from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import wraps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +45,15 @@ class EnhancedPowerMonitor:
     def __init__(self):
         self.min_capacity_mw = 100
         self.session = requests.Session()
+        # Keep-alive pool per host, with retries on throttling and transient 5xx
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -59,7 +70,7 @@ class EnhancedPowerMonitor:
             capacity = float(text)
             if capacity >= self.min_capacity_mw:
                 return capacity
-        except:
+        except ValueError:
             pass
         
         # Try extracting number from text
@@ -69,7 +80,7 @@ class EnhancedPowerMonitor:
                 capacity = float(match.group(1))
                 if capacity >= self.min_capacity_mw:
                     return capacity
-            except:
+            except ValueError:
                 pass
         
         return None
@@ -77,7 +88,8 @@ class EnhancedPowerMonitor:
     def generate_hash(self, data):
         """Generate unique hash for duplicate detection"""
         key = f"{data.get('project_name', '')}_{data.get('capacity_mw', 0)}_{data.get('location', '')}_{data.get('source', '')}"
-        return hashlib.md5(key.lower().encode()).hexdigest()
+        # 8-byte blake2b, as in app.py: ample to tell projects apart, half MD5's width
+        return hashlib.blake2b(key.lower().encode(), digest_size=8).hexdigest()
     
     def calculate_hunter_score(self, project_data):
         """
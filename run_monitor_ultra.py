@@ -1,10 +1,11 @@
-import time
 import schedule
 import logging
 import signal
 import sys
+import threading
 from datetime import datetime
-from app_complete import app, run_full_scan
+# Importing the app only sets it up; the first scan is queued below
+from app_complete import start_scan
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,19 +14,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 def job():
-    """Wrapper to run the scan within the Flask app context"""
+    """Queue a full scan, unless a web sync or earlier job is still pending"""
     logger.info("⏰ Scheduled Job Triggered: Starting Full Scan...")
     try:
-        with app.app_context():
-            run_full_scan()
-        logger.info("✅ Scheduled Job Completed Successfully.")
+        # Runs in app_complete's scan process and records its outcome in scan_jobs
+        job_id, created = start_scan()
+        if created:
+            logger.info(f"✅ Scan queued as job {job_id}.")
+        else:
+            logger.info(f"⏭️ Scan {job_id} already pending, skipping.")
     except Exception as e:
         logger.error(f"❌ Critical Job Failure: {e}", exc_info=True)
 
+# Set on shutdown; the main loop waits on it instead of sleeping, so it is
+# idle between checks. A scan in progress keeps the process alive until it
+# finishes or the platform follows SIGTERM with SIGKILL.
+stop_event = threading.Event()
+
 def graceful_shutdown(signum, frame):
     """Handle shutdown signals"""
     logger.info("🛑 Received shutdown signal. Exiting worker...")
-    sys.exit(0)
+    stop_event.set()
 
 # Schedule: Every 6 hours + Daily at 8 AM UTC
 schedule.every(6).hours.do(job)
@@ -43,12 +52,10 @@ if __name__ == "__main__":
     job()
     
     # Main loop
-    while True:
+    while not stop_event.is_set():
         try:
             schedule.run_pending()
-            time.sleep(60)
-        except KeyboardInterrupt:
-            graceful_shutdown(None, None)
         except Exception as e:
             logger.error(f"⚠️ Unexpected Scheduler Error: {e}")
-            time.sleep(60)
+        stop_event.wait(60)
+    sys.exit(0)
@@ -45,9 +45,14 @@ import pandas as pd
 import hashlib
 import json
 import re
+import tempfile
+import openpyxl
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from io import BytesIO, StringIO
+from io import BytesIO
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import gridstatus
@@ -67,6 +72,15 @@ class FixedPowerMonitor:
     def __init__(self, min_capacity_mw=100):
         self.min_capacity_mw = min_capacity_mw
         self.session = requests.Session()
+        # Keep-alive pool per host, with retries on throttling and transient 5xx
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': '*/*',
@@ -105,7 +119,8 @@ class FixedPowerMonitor:
     def generate_hash(self, data):
         """Generate unique hash for deduplication"""
         key = f"{data.get('project_name', '')}_{data.get('capacity_mw', 0)}_{data.get('state', '')}_{data.get('source', '')}"
-        return hashlib.md5(key.lower().encode()).hexdigest()
+        # 8-byte blake2b, as in app.py: ample to tell projects apart, half MD5's width
+        return hashlib.blake2b(key.lower().encode(), digest_size=8).hexdigest()
     
     def classify_project(self, name, customer='', fuel_type=''):
         """Classify project type based on keywords"""
@@ -347,98 +362,145 @@ class FixedPowerMonitor:
             'Origin': 'https://emp.lbl.gov',
         }
         
-        excel_data = None
+        excel_path = None
         successful_url = None
         
         for url in possible_urls:
             try:
                 logger.info(f"Berkeley Lab: Trying {url}")
-                response = self.session.get(url, headers=headers, timeout=120)
-                
-                if response.status_code == 200 and len(response.content) > 100000:  # >100KB
-                    excel_data = BytesIO(response.content)
-                    successful_url = url
-                    logger.info(f"Berkeley Lab: SUCCESS! Downloaded {len(response.content)/1024/1024:.1f} MB")
-                    break
-                elif response.status_code == 403:
-                    logger.warning(f"Berkeley Lab: 403 Forbidden - may need different headers")
-                elif response.status_code == 404:
-                    logger.debug(f"Berkeley Lab: 404 Not Found - trying next URL")
+                # Streamed to a temp file so the workbook is never held in memory
+                with self.session.get(url, headers=headers, timeout=120, stream=True) as response:
+                    if response.status_code == 200:
+                        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+                            try:
+                                for chunk in response.iter_content(chunk_size=1 << 20):
+                                    tmp.write(chunk)
+                            except Exception:
+                                # Don't leave a partial download behind
+                                tmp.close()
+                                os.unlink(tmp.name)
+                                raise
+                        size = os.path.getsize(tmp.name)
+                        if size > 100000:  # >100KB
+                            excel_path = tmp.name
+                            successful_url = url
+                            logger.info(f"Berkeley Lab: SUCCESS! Downloaded {size/1024/1024:.1f} MB")
+                            break
+                        os.unlink(tmp.name)
+                    elif response.status_code == 403:
+                        logger.warning(f"Berkeley Lab: 403 Forbidden - may need different headers")
+                    elif response.status_code == 404:
+                        logger.debug(f"Berkeley Lab: 404 Not Found - trying next URL")
                     
             except Exception as e:
                 logger.warning(f"Berkeley Lab: Failed {url}: {e}")
                 continue
         
-        if not excel_data:
+        if not excel_path:
             logger.error("Berkeley Lab: Could not download from any URL")
             logger.info("Berkeley Lab: Try manually downloading from https://emp.lbl.gov/queues")
             return projects
         
         try:
-            # Berkeley Lab Excel has multiple sheets - first sheet is usually project data
-            df = pd.read_excel(excel_data, sheet_name=0, engine='openpyxl')
-            logger.info(f"Berkeley Lab: Loaded {len(df)} rows")
-            logger.info(f"Berkeley Lab: Columns: {list(df.columns)[:10]}")
-            
-            # Column name mapping (Berkeley Lab uses various naming conventions)
-            capacity_cols = ['capacity_mw_resource', 'Capacity (MW)', 'capacity_mw', 'mw', 'MW']
-            entity_cols = ['entity', 'Entity', 'iso', 'ISO', 'rto', 'RTO', 'ba', 'balancing_authority']
-            
-            for _, row in df.iterrows():
-                try:
-                    # Find entity/ISO
-                    entity = None
-                    for col in entity_cols:
-                        if col in df.columns and pd.notna(row.get(col)):
-                            entity = str(row.get(col)).strip()
-                            break
-                    
-                    if not entity:
-                        continue
-                    
-                    # Find capacity
-                    capacity = None
-                    for col in capacity_cols:
-                        if col in df.columns:
-                            capacity = self.extract_capacity(row.get(col))
+            # Stream row tuples off the first sheet rather than building a
+            # DataFrame of the whole (100k+ row) workbook
+            wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+            try:
+                rows = wb.worksheets[0].iter_rows(values_only=True)
+                header = next(rows, ())
+                logger.info(f"Berkeley Lab: Columns: {list(header)[:10]}")
+                col_idx = {}
+                for i, name in enumerate(header):
+                    if name is not None:
+                        col_idx.setdefault(str(name), i)
+                
+                def column(*names):
+                    """Index of the first of names in the header"""
+                    for name in names:
+                        if name in col_idx:
+                            return col_idx[name]
+                    return None
+                
+                def cell(row, i, default=''):
+                    """Value at index i of row, or default when absent or blank"""
+                    if i is None or i >= len(row) or row[i] is None:
+                        return default
+                    return row[i]
+                
+                # Column name mapping (Berkeley Lab uses various naming conventions)
+                capacity_cols = ['capacity_mw_resource', 'Capacity (MW)', 'capacity_mw', 'mw', 'MW']
+                entity_cols = ['entity', 'Entity', 'iso', 'ISO', 'rto', 'RTO', 'ba', 'balancing_authority']
+                entity_idx = [col_idx[c] for c in entity_cols if c in col_idx]
+                capacity_idx = [col_idx[c] for c in capacity_cols if c in col_idx]
+                status_i = column('queue_status', 'Status')
+                queue_i = column('queue_id', 'Queue ID')
+                name_i = column('project_name', 'Project Name')
+                developer_i = column('developer', 'Developer')
+                fuel_i = column('resource_type_primary', 'Fuel Type')
+                county_i = column('county', 'County')
+                state_i = column('state', 'State')
+                
+                skipped = 0
+                for row in rows:
+                    try:
+                        # Find entity/ISO
+                        entity = None
+                        for i in entity_idx:
+                            if cell(row, i, None) is not None:
+                                entity = str(row[i]).strip()
+                                break
+                        
+                        if not entity:
+                            continue
+                        
+                        # Find capacity
+                        capacity = None
+                        for i in capacity_idx:
+                            capacity = self.extract_capacity(cell(row, i, None))
                             if capacity:
                                 break
-                    
-                    if not capacity:
-                        continue
-                    
-                    # Skip withdrawn projects
-                    status = str(row.get('queue_status', row.get('Status', 'Active')))
-                    if 'withdraw' in status.lower():
+                        
+                        if not capacity:
+                            continue
+                        
+                        # Skip withdrawn projects
+                        status = str(cell(row, status_i, 'Active'))
+                        if 'withdraw' in status.lower():
+                            continue
+                        
+                        queue_id = str(cell(row, queue_i))
+                        proj_name = str(cell(row, name_i, 'Unknown'))[:500]
+                        customer = str(cell(row, developer_i))[:500]
+                        fuel = str(cell(row, fuel_i))
+                        
+                        data = {
+                            'request_id': f"{entity}_{queue_id}" if queue_id else f"{entity}_{len(projects)}",
+                            'queue_position': queue_id,
+                            'project_name': proj_name,
+                            'capacity_mw': capacity,
+                            'county': str(cell(row, county_i))[:200],
+                            'state': str(cell(row, state_i))[:2],
+                            'customer': customer,
+                            'developer': customer,
+                            'utility': entity,
+                            'status': status,
+                            'fuel_type': fuel,
+                            'source': f'{entity} (Berkeley Lab)',
+                            'source_url': successful_url,
+                            'project_type': self.classify_project(proj_name, customer, fuel)
+                        }
+                        data['data_hash'] = self.generate_hash(data)
+                        projects.append(data)
+                        
+                    except (KeyError, ValueError, TypeError) as e:
+                        skipped += 1
+                        logger.debug(f"Berkeley Lab: Bad row {row[:3]}: {e}")
                         continue
-                    
-                    queue_id = str(row.get('queue_id', row.get('Queue ID', '')))
-                    proj_name = str(row.get('project_name', row.get('Project Name', 'Unknown')))[:500]
-                    customer = str(row.get('developer', row.get('Developer', '')))[:500]
-                    fuel = str(row.get('resource_type_primary', row.get('Fuel Type', '')))
-                    
-                    data = {
-                        'request_id': f"{entity}_{queue_id}" if queue_id else f"{entity}_{len(projects)}",
-                        'queue_position': queue_id,
-                        'project_name': proj_name,
-                        'capacity_mw': capacity,
-                        'county': str(row.get('county', row.get('County', '')))[:200],
-                        'state': str(row.get('state', row.get('State', '')))[:2],
-                        'customer': customer,
-                        'developer': customer,
-                        'utility': entity,
-                        'status': status,
-                        'fuel_type': fuel,
-                        'source': f'{entity} (Berkeley Lab)',
-                        'source_url': successful_url,
-                        'project_type': self.classify_project(proj_name, customer, fuel)
-                    }
-                    data['data_hash'] = self.generate_hash(data)
-                    projects.append(data)
-                    
-                except Exception as e:
-                    continue
+            finally:
+                wb.close()
             
+            if skipped:
+                logger.warning(f"Berkeley Lab: Skipped {skipped} malformed rows")
             logger.info(f"Berkeley Lab: Parsed {len(projects)} projects >= {self.min_capacity_mw} MW")
             
             # Log breakdown by entity
@@ -450,6 +512,8 @@ class FixedPowerMonitor:
             
         except Exception as e:
             logger.error(f"Berkeley Lab: Error parsing Excel: {e}")
+        finally:
+            os.unlink(excel_path)
         
         return projects
 
@@ -604,16 +668,16 @@ class FixedPowerMonitor:
             response = self.session.get(url, timeout=30, verify=False)
             
             if response.status_code == 200:
-                # Try to find header row
-                lines = response.text.split('\n')
+                # Find the header row in the first few lines only, then parse the
+                # bytes directly instead of decoding, splitting and re-joining them
+                lines = response.content.split(b'\n', 10)[:10]
                 header_idx = 0
-                for i, line in enumerate(lines[:10]):
-                    if 'MW' in line or 'Request' in line or 'Project' in line:
+                for i, line in enumerate(lines):
+                    if b'MW' in line or b'Request' in line or b'Project' in line:
                         header_idx = i
                         break
                 
-                csv_data = '\n'.join(lines[header_idx:])
-                df = pd.read_csv(StringIO(csv_data))
+                df = pd.read_csv(BytesIO(response.content), skiprows=header_idx, encoding_errors='replace')
                 logger.info(f"SPP: {len(df)} rows")
                 
                 for _, row in df.iterrows():
@@ -681,10 +745,18 @@ class FixedPowerMonitor:
         logger.info("PHASE 1: Real-Time Sources")
         logger.info("=" * 60)
         
-        for source_name, fetch_func in real_time_sources:
-            try:
+        # Every source is an independent download, so all of them (Berkeley Lab
+        # included) run side by side; results are still taken in the order above
+        with ThreadPoolExecutor(max_workers=len(real_time_sources) + 1) as pool:
+            futures = []
+            for source_name, fetch_func in real_time_sources:
                 logger.info(f"→ Fetching {source_name}...")
-                projects = fetch_func()
+                futures.append((source_name, pool.submit(fetch_func)))
+            berkeley_future = pool.submit(self.fetch_berkeley_lab)
+        
+        for source_name, future in futures:
+            try:
+                projects = future.result()
                 all_projects.extend(projects)
                 source_stats[source_name] = len(projects)
                 logger.info(f"✓ {source_name}: {len(projects)} projects")
@@ -701,7 +773,7 @@ class FixedPowerMonitor:
         logger.info("=" * 60)
         
         try:
-            berkeley_projects = self.fetch_berkeley_lab()
+            berkeley_projects = berkeley_future.result()
             
             # Extract PJM specifically (since we can't get it directly)
             pjm_projects = [p for p in berkeley_projects if p.get('utility') == 'PJM']
@@ -728,7 +800,8 @@ class FixedPowerMonitor:
         unique_projects = []
         
         for project in all_projects:
-            hash_val = project.get('data_hash', self.generate_hash(project))
+            # Fetchers set data_hash already; only hash projects that lack one
+            hash_val = project.get('data_hash') or self.generate_hash(project)
             if hash_val not in seen_hashes:
                 seen_hashes.add(hash_val)
                 unique_projects.append(project)